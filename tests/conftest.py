@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Los módulos de threads_sockets se importan por nombre, como en los scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'threads_sockets'))
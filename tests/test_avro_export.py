@@ -0,0 +1,32 @@
+import datetime
+import fastavro
+import pandas as pd
+from exporters import AvroWriter, avro_schema, open_writer
+
+def test_nulls_round_trip(tmp_path):
+    df = pd.DataFrame({
+        'ID_VENTA': ['V1', pd.NA, 'V3'],
+        'FECHA_VENTA': [datetime.date(2024, 1, 2), None, datetime.date(2024, 3, 4)],
+        'MOMENTO': pd.to_datetime(['2024-01-02 10:00', None, '2024-03-04 12:30']),
+        'ID_CLIENTE': pd.array([1, pd.NA, 3], dtype='Int64'),
+        'DESCUENTO': [0.1, float('nan'), 0.3]
+    })
+    assert all(isinstance(field['type'], list) and field['type'][0] == 'null'
+               for field in avro_schema(df)['fields'])
+
+    path = str(tmp_path / 'ventas.avro')
+    writer = open_writer('AVRO', path)
+    writer.write(df)
+    assert writer.close()[0] == path
+
+    with open(path, 'rb') as f:
+        records = list(fastavro.reader(f))
+    assert [record['ID_CLIENTE'] for record in records] == [1, None, 3]
+    assert records[1] == dict.fromkeys(df.columns)
+    assert records[0]['FECHA_VENTA'] == datetime.date(2024, 1, 2)
+    assert records[2]['MOMENTO'].replace(tzinfo=None) == datetime.datetime(2024, 3, 4, 12, 30)
+
+def test_empty_file_is_valid(tmp_path):
+    path = str(tmp_path / 'vacio.avro')
+    assert open_writer('AVRO', path).close()[0] == path
+    assert AvroWriter.read(path).empty
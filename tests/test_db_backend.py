@@ -0,0 +1,46 @@
+import pytest
+from db_backend import ConnectionPool, SQLiteBackend
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def test_recycles_old_connections(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('db_backend.time.monotonic', lambda: now[0])
+    pool = ConnectionPool(FakeConnection, size=1, recycle=10)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as again:
+        assert again is first
+    now[0] = 11.0
+    with pool.connection() as fresh:
+        assert fresh is not first
+    assert first.closed
+
+def test_discards_dead_and_broken_connections():
+    pool = ConnectionPool(FakeConnection, size=1, recycle=0,
+                          is_alive=lambda cnx: not cnx.closed)
+    with pytest.raises(RuntimeError):
+        with pool.connection() as broken:
+            raise RuntimeError("falla")
+    assert broken.closed
+    with pool.connection() as cnx:
+        assert cnx is not broken
+
+def test_timeout_when_exhausted():
+    pool = ConnectionPool(FakeConnection, size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(TimeoutError):
+            pool.acquire()
+
+def test_sqlite_file_is_seeded_once(tmp_path):
+    path = str(tmp_path / 'ventas.db')
+    for _ in range(2):
+        backend = SQLiteBackend(path, rows=50)
+        with backend.connection() as cnx:
+            assert cnx.execute("SELECT COUNT(*) FROM VENTAS").fetchone()[0] == 50
+        backend.close()
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from external_sort import external_sort
+from data_generator import generate_ventas
+
+def chunks_of(df, rows):
+    for start in range(0, len(df), rows):
+        yield df.iloc[start:start + rows]
+
+def test_text_column_sorted_across_runs(tmp_path):
+    df = generate_ventas(5000, seed=1)
+    df = df.take(np.random.default_rng(1).permutation(len(df))).reset_index(drop=True)
+    df.loc[[3, 700, 4100], 'ID_VENTA'] = None
+    output = str(tmp_path / 'sorted.parquet')
+
+    # Presupuesto chico: varias corridas cuyos códigos de texto no coinciden
+    info = external_sort(chunks_of(df, 500), output, column='ID_VENTA',
+                         memory_budget=200 * 1024, temp_dir=str(tmp_path), batch_rows=128)
+
+    result = pq.read_table(output).to_pandas()
+    assert info['runs'] > 1
+    assert info['rows'] == len(df)
+    ids = result['ID_VENTA']
+    assert ids.tail(3).isna().all()
+    assert ids.head(len(df) - 3).tolist() == sorted(df['ID_VENTA'].dropna())
+
+def test_date_column_sorted_across_runs(tmp_path):
+    df = generate_ventas(5000, seed=2)
+    output = str(tmp_path / 'sorted.arrow')
+    info = external_sort(chunks_of(df, 500), output, memory_budget=200 * 1024,
+                         temp_dir=str(tmp_path), batch_rows=128)
+
+    result = pa.ipc.open_file(output).read_all().to_pandas()
+    assert info['runs'] > 1
+    assert pd.Series(result['FECHA_VENTA']).is_monotonic_increasing
+
+def test_oversized_chunk_is_split_into_runs(tmp_path):
+    df = generate_ventas(5000, seed=3)
+    output = str(tmp_path / 'sorted.parquet')
+    # Un único chunk mucho más grande que el presupuesto de una corrida
+    info = external_sort([df], output, memory_budget=200 * 1024, temp_dir=str(tmp_path))
+
+    result = pq.read_table(output).to_pandas()
+    assert info['runs'] > 1
+    assert len(result) == len(df)
+    assert pd.Series(result['FECHA_VENTA']).is_monotonic_increasing
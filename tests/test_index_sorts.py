@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from index_sorts import bubble_order, merge_order, quick_order, heap_order, sort_keys, sort_by
+
+ORDERS = [bubble_order, merge_order, quick_order, heap_order]
+# Heap sort no es estable: en los empates solo se compara el orden de las claves
+STABLE = {bubble_order, merge_order, quick_order}
+
+def make_keys(kind, n):
+    rng = np.random.default_rng(n)
+    if kind == 'random':
+        return rng.integers(0, 10 * n + 1, n)
+    if kind == 'duplicates':
+        return rng.integers(0, 4, n)
+    if kind == 'sorted':
+        return np.arange(n)
+    if kind == 'reversed':
+        return np.arange(n)[::-1].copy()
+    return rng.random(n)
+
+@pytest.mark.parametrize('order_fn', ORDERS, ids=lambda f: f.__name__)
+@pytest.mark.parametrize('kind', ['random', 'duplicates', 'sorted', 'reversed', 'float'])
+@pytest.mark.parametrize('n', [0, 1, 2, 31, 33, 100, 1000])
+def test_matches_stable_argsort(order_fn, kind, n):
+    keys = make_keys(kind, n)
+    order = order_fn(keys)
+    expected = np.argsort(keys, kind='stable')
+    if order_fn in STABLE:
+        assert np.array_equal(order, expected)
+    else:
+        assert np.array_equal(np.sort(order), np.arange(n))
+        assert np.array_equal(keys[order], keys[expected])
+
+def test_tz_aware_dates():
+    df = pd.DataFrame({'FECHA_VENTA': pd.to_datetime(
+        ['2024-03-01 10:00', '2024-01-01 00:00', None, '2024-02-01 12:00']).tz_localize('America/Bogota')})
+    keys = sort_keys(df)
+    assert keys.dtype == np.int64
+    result = sort_by(df, quick_order)
+    assert result.index.tolist() == [1, 3, 0, 2]
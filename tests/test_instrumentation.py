@@ -0,0 +1,14 @@
+import numpy as np
+from instrumentation import track_memory
+
+def test_nested_blocks_keep_outer_peak():
+    with track_memory() as outer:
+        big = np.ones(4_000_000)
+        del big
+        with track_memory() as inner:
+            small = np.ones(400_000)
+            del small
+    # El bloque interno reinicia el pico de tracemalloc sin perder el externo
+    assert outer.py_peak >= 32_000_000
+    assert 3_200_000 <= inner.py_peak < 32_000_000
+    assert outer.rss_peak > 0 and inner.rss_peak > 0
@@ -0,0 +1,71 @@
+import asyncio
+import socket
+import pytest
+from protocol import (PREFIX, MAGIC, VERSION, MAX_HEADER_SIZE, MAX_BODY_SIZE, ProtocolError,
+                      pack_message, send_message, send_packed, recv_message, recv_dataframe,
+                      read_message_async)
+from data_generator import generate_ventas
+
+@pytest.fixture
+def pair():
+    a, b = socket.socketpair()
+    yield a, b
+    a.close()
+    b.close()
+
+def test_dataframe_round_trip(pair):
+    df = generate_ventas(200, seed=5)
+    send_message(pair[0], {'algorithm': 'quick', 'request_id': 7}, df)
+    header, result = recv_dataframe(pair[1])
+    assert header == {'algorithm': 'quick', 'request_id': 7}
+    assert result.equals(df)
+
+def test_header_only_message(pair):
+    send_packed(pair[0], *pack_message({'status': 'busy'}))
+    assert recv_message(pair[1]) == ({'status': 'busy'}, bytearray())
+
+def test_closed_before_message(pair):
+    pair[0].close()
+    assert recv_message(pair[1]) == (None, None)
+
+def test_truncated_prefix(pair):
+    head, _ = pack_message({'status': 'ok'})
+    pair[0].sendall(head[:5])
+    pair[0].close()
+    with pytest.raises(ConnectionError):
+        recv_message(pair[1])
+
+@pytest.mark.parametrize('prefix', [
+    PREFIX.pack(b'XXXX', VERSION, 0, 2, 0),
+    PREFIX.pack(MAGIC, VERSION + 1, 0, 2, 0),
+    PREFIX.pack(MAGIC, VERSION, 0, MAX_HEADER_SIZE + 1, 0),
+    PREFIX.pack(MAGIC, VERSION, 0, 2, MAX_BODY_SIZE + 1)
+], ids=['magic', 'version', 'header', 'body'])
+def test_invalid_prefix(pair, prefix):
+    pair[0].sendall(prefix + b'{}')
+    with pytest.raises(ProtocolError):
+        recv_message(pair[1])
+
+def test_idle_timeout_only_before_message(pair):
+    with pytest.raises(socket.timeout):
+        recv_message(pair[1], idle_timeout=0.05)
+    head, body = pack_message({'status': 'ok'}, b'x' * 10)
+    pair[0].sendall(head)
+    pair[0].sendall(body)
+    assert recv_message(pair[1], idle_timeout=0.05, io_timeout=1.0) == (
+        {'status': 'ok'}, bytearray(b'x' * 10))
+
+def test_async_round_trip():
+    head, body = pack_message({'algorithm': 'merge'}, b'abc')
+
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(head + bytes(body))
+        reader.feed_eof()
+        first = await read_message_async(reader, idle_timeout=1.0)
+        second = await read_message_async(reader, idle_timeout=1.0)
+        return first, second
+
+    first, second = asyncio.run(read())
+    assert first == ({'algorithm': 'merge'}, b'abc')
+    assert second == (None, None)
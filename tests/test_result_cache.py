@@ -0,0 +1,31 @@
+from result_cache import ResultCache
+
+class CountingBackend:
+    def __init__(self):
+        self.calls = 0
+
+    def sort(self, algorithm, body, column='FECHA_VENTA'):
+        self.calls += 1
+        return bytes(body[::-1]), 0.5
+
+def test_hits_skip_the_backend():
+    backend = CountingBackend()
+    cache = ResultCache(backend, max_bytes=100)
+    assert cache.sort_cached('quick', b'abc') == (b'cba', 0.5, False)
+    assert cache.sort_cached('quick', b'abc') == (b'cba', 0.5, True)
+    assert cache.sort('merge', b'abc') == (b'cba', 0.5)
+    assert backend.calls == 2
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+def test_lru_budget():
+    cache = ResultCache(CountingBackend(), max_bytes=25)
+    for body in (b'a' * 10, b'b' * 10):
+        cache.sort('quick', body)
+    cache.sort('quick', b'a' * 10)           # 'a' pasa a ser la más reciente
+    cache.sort('quick', b'c' * 10)           # desaloja 'b'
+    stats = cache.stats()
+    assert stats['bytes'] <= 25 and stats['entries'] == 2 and stats['evictions'] == 1
+    assert cache.sort_cached('quick', b'a' * 10)[2]
+    assert not cache.sort_cached('quick', b'b' * 10)[2]
+    cache.sort('quick', b'd' * 30)           # más grande que el presupuesto: no se guarda
+    assert cache.stats()['entries'] <= 2
@@ -0,0 +1,24 @@
+from results_store import ResultsStore
+
+def samples(run_id, method, seconds):
+    return [{'run_id': run_id, 'method': method, 'size': 100, 'stage': 'sort',
+             'iteration': i, 'seconds': s} for i, s in enumerate(seconds, 1)]
+
+def test_append_and_scan(tmp_path):
+    store = ResultsStore(str(tmp_path / 'store'))
+    assert store.scan().num_rows == 0
+    assert store.append(samples('r1', 'quick', [1.0, 3.0])) == 2
+    store.append(samples('r2', 'merge', [2.0]))
+    store.append([{'run_id': 'r2', 'method': 'merge', 'format': 'CSV', 'size': 100,
+                   'stage': 'export', 'seconds': 0.5, 'bytes': 10}])
+
+    assert store.run_ids() == ['r1', 'r2']
+    assert store.scan().num_rows == 4
+    quick = store.scan(columns=['seconds'], method='quick').to_pydict()
+    assert sorted(quick['seconds']) == [1.0, 3.0]
+    exports = store.scan(columns=['format', 'bytes'], stage='export').to_pydict()
+    assert exports == {'format': ['CSV'], 'bytes': [10]}
+
+    summary = store.aggregate(['method'], stage='sort').set_index('method')
+    assert summary.loc['quick', 'seconds_mean'] == 2.0
+    assert summary.loc['merge', 'seconds_count'] == 1
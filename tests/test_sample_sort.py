@@ -0,0 +1,19 @@
+import threading
+import numpy as np
+from sample_sort import sample_order
+
+def test_concurrent_calls_with_different_worker_counts():
+    keys = np.random.default_rng(0).integers(0, 10 ** 6, 50000)
+    expected = np.sort(keys)
+    results = []
+
+    def run(workers):
+        order = sample_order(keys, workers=workers, min_parallel_rows=1000)
+        results.append(np.array_equal(keys[order], expected))
+
+    threads = [threading.Thread(target=run, args=(2 + i % 2,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+    assert results == [True] * 8
@@ -0,0 +1,26 @@
+import pytest
+from snapshot import SortedSnapshot
+from data_generator import generate_ventas
+
+def batches(df, rows):
+    return [df.iloc[start:start + rows] for start in range(0, len(df), rows)]
+
+@pytest.mark.parametrize('column', ['FECHA_VENTA', 'ID_CLIENTE', 'ID_VENTA'])
+def test_incremental_refresh_matches_full_sort(tmp_path, column):
+    df = generate_ventas(3000, seed=3).sample(frac=1, random_state=3).reset_index(drop=True)
+    snapshot = SortedSnapshot(str(tmp_path), column=column, part_rows=400)
+    for chunk in batches(df, 1000):
+        snapshot.refresh([chunk])
+
+    result = snapshot.load()
+    expected = df.sort_values(column, kind='stable').reset_index(drop=True)
+    assert result[column].tolist() == expected[column].tolist()
+    assert snapshot.watermark == df['ID_VENTA'].max()
+    for part in snapshot.manifest['parts']:
+        assert part['min'] <= part['max']
+
+def test_rejects_variable_width_ids(tmp_path):
+    df = generate_ventas(20, seed=4)
+    df.loc[5, 'ID_VENTA'] = 'V9'
+    with pytest.raises(ValueError):
+        SortedSnapshot(str(tmp_path)).refresh([df])
@@ -1,23 +1,111 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-from sklearn.linear_model import LinearRegression
 import os
 import json
-from statsmodels.tsa.stattools import adfuller
+import hashlib
 import warnings
 warnings.filterwarnings('ignore')
 
-# Configuración de estilos CORREGIDA
-try:
-    plt.style.use('seaborn-v0_8')  # Para versiones recientes de matplotlib
-except:
-    plt.style.use('ggplot')  # Estilo alternativo si el anterior no está disponible
+# matplotlib, seaborn, scipy y statsmodels se importan recién cuando una etapa
+# los necesita, así cargar el módulo (o correr solo las estadísticas) es rápido
+_plotting = None
 
-sns.set_theme(style="whitegrid")  # Configuración moderna de seaborn
-plt.rcParams['figure.figsize'] = (12, 6)
+def plotting():
+    """Devuelve (plt, sns) con el backend no interactivo Agg y los estilos aplicados"""
+    global _plotting
+    if _plotting is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        # Configuración de estilos CORREGIDA
+        try:
+            plt.style.use('seaborn-v0_8')  # Para versiones recientes de matplotlib
+        except OSError:
+            plt.style.use('ggplot')  # Estilo alternativo si el anterior no está disponible
+        
+        sns.set_theme(style="whitegrid")  # Configuración moderna de seaborn
+        plt.rcParams['figure.figsize'] = (12, 6)
+        _plotting = plt, sns
+    return _plotting
+
+# Etapas del análisis de resultados_completos.csv, en orden de ejecución.
+# Las de gráficos son independientes y pueden correr en procesos aparte.
+# La etapa 'memory' solo corre si los resultados incluyen mediciones de memoria.
+STAGES = ['stats', 'comparison', 'tests', 'temporal', 'scalability', 'memory', 'report']
+PLOT_STAGES = {
+    'comparison': 'performance_comparison',
+    'temporal': 'temporal_analysis',
+    'scalability': 'scalability_analysis',
+    'memory': 'memory_analysis'
+}
+
+# Archivos que genera cada etapa; si su entrada no cambió y siguen existiendo,
+# la etapa no se vuelve a correr. Subir STAGE_CACHE_VERSION invalida todo
+# (p. ej. al cambiar cómo se dibuja un gráfico).
+STAGE_OUTPUTS = {
+    'stats': ['basic_stats.csv'],
+    'comparison': ['performance_comparison.png'],
+    'tests': ['statistical_tests.txt'],
+    'temporal': ['temporal_analysis.png'],
+    'scalability': ['scalability_analysis.png'],
+    'memory': ['memory_analysis.png'],
+    'report': ['benchmark_report.html']
+}
+STAGE_CACHE_VERSION = 1
+
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class StageCache:
+    """Guarda, por etapa, el hash de sus entradas y los archivos generados"""
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, 'stage_cache.json')
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def is_fresh(self, stage, key):
+        entry = self.entries.get(stage)
+        return (entry is not None and entry['key'] == key and
+                all(os.path.exists(os.path.join(self.output_dir, name)) for name in entry['outputs']))
+    
+    def record(self, stage, key):
+        self.entries[stage] = {'key': key, 'outputs': STAGE_OUTPUTS[stage]}
+        with open(self.path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+
+def _run_plot_stage(analyzer, stage):
+    getattr(analyzer, PLOT_STAGES[stage])()
+    return stage
+
+# Modelos de costo para el ajuste empírico de complejidad: t(n) = a + c * f(n)
+COMPLEXITY_MODELS = {
+    'n': lambda n: n,
+    'n log n': lambda n: n * np.log2(n),
+    'n^2': lambda n: n ** 2
+}
+
+def fit_complexity(sizes, times):
+    """Ajusta cada modelo por mínimos cuadrados relativos (los tiempos abarcan
+    varios órdenes de magnitud) y devuelve una fila por modelo con c, a y el
+    error relativo (RMSE de (t - t_ajustado) / t)"""
+    sizes = np.asarray(sizes, dtype=float)
+    times = np.asarray(times, dtype=float)
+    fits = []
+    for name, f in COMPLEXITY_MODELS.items():
+        design = np.column_stack([np.ones_like(sizes), f(sizes)]) / times[:, None]
+        (a, c), *_ = np.linalg.lstsq(design, np.ones_like(times), rcond=None)
+        if c <= 0:
+            # Sin término creciente el modelo no explica nada: solo constante
+            a, c = np.median(times), 0.0
+        predicted = a + c * f(sizes)
+        rel_rmse = float(np.sqrt(np.mean(((times - predicted) / times) ** 2)))
+        fits.append({'model': name, 'c': float(c), 'a': float(a), 'rel_rmse': rel_rmse})
+    return fits
 
 class SortingBenchmarkAnalyzer:
     def __init__(self, results_path='exports/resultados_completos.csv', detailed_dir='exports/detailed_results'):
@@ -25,8 +113,11 @@ class SortingBenchmarkAnalyzer:
         self.detailed_dir = detailed_dir
         self.results_df = None
         self.iteration_data = None
+        self.benchmark_df = None
+        self.benchmark_meta = None
         self.output_dir = 'analysis_results'
         os.makedirs(self.output_dir, exist_ok=True)
+        self.stage_cache = StageCache(self.output_dir)
     
     def load_data(self):
         """Carga los datos generados por el benchmark"""
@@ -48,6 +139,60 @@ class SortingBenchmarkAnalyzer:
             print(f"Error al cargar datos: {str(e)}")
             raise
     
+    def load_store(self, root='results_store', run_ids=None, methods=None, formats=None):
+        """Carga resultados desde el almacén Parquet particionado (por defecto la
+        última corrida). Solo lee las particiones y columnas necesarias y
+        arma results_df e iteration_data con la misma forma que load_data."""
+        from results_store import ResultsStore
+        store = ResultsStore(root)
+        if run_ids is None:
+            available = store.run_ids()
+            if not available:
+                print(f"Advertencia: el almacén {root} está vacío")
+                return None
+            run_ids = available[-1:]
+        
+        memory_fields = ['rss_peak', 'py_peak', 'py_blocks']
+        sorts = store.scan(['method', 'iteration', 'seconds'] + memory_fields,
+                           run_id=list(run_ids), method=methods, stage='sort').to_pandas()
+        exports = store.scan(['method', 'format', 'seconds', 'bytes'] + memory_fields,
+                             run_id=list(run_ids), method=methods, format=formats,
+                             stage='export').to_pandas()
+        
+        sort_stats = sorts.groupby('method').agg(
+            avg_sort=('seconds', 'mean'), min_sort=('seconds', 'min'), max_sort=('seconds', 'max'),
+            **{f'sort_{field}': (field, 'max') for field in memory_fields}).reset_index()
+        exports = exports.rename(columns={'seconds': 'export_time', 'bytes': 'file_size',
+                                          **{field: f'export_{field}' for field in memory_fields}})
+        self.results_df = sort_stats.merge(exports, on='method')
+        
+        self.iteration_data = {}
+        for method, group in sorts.sort_values('iteration').groupby('method'):
+            times = group['seconds'].tolist()
+            self.iteration_data[method] = {
+                'sort_method': method,
+                'iteration_times': times,
+                'average_time': sum(times) / len(times),
+                'min_time': min(times),
+                'max_time': max(times)
+            }
+        return self.results_df
+    
+    def store_summary(self, root='results_store', group_by=('method', 'format', 'size'),
+                      **filters):
+        """Estadísticas agregadas de todas las muestras del almacén (o las que
+        cumplan `filters`) sin cargarlas en memoria completas"""
+        from results_store import ResultsStore
+        summary = ResultsStore(root).aggregate(list(group_by), **filters)
+        summary.to_csv(os.path.join(self.output_dir, 'store_summary.csv'), index=False)
+        return summary
+    
+    def load_benchmark(self, path):
+        """Carga los resultados de benchmark.py (JSON o Parquet versionado)"""
+        from benchmark import load_results
+        self.benchmark_df, self.benchmark_meta = load_results(path)
+        return self.benchmark_df
+    
     def basic_statistical_analysis(self):
         """Análisis estadístico descriptivo básico"""
         stats = self.results_df.groupby('method').agg({
@@ -64,6 +209,7 @@ class SortingBenchmarkAnalyzer:
     
     def performance_comparison(self):
         """Comparación visual del rendimiento"""
+        plt, sns = plotting()
         plt.figure(figsize=(14, 7))
         
         # Boxplot de tiempos por algoritmo
@@ -87,6 +233,7 @@ class SortingBenchmarkAnalyzer:
     
     def statistical_tests(self):
         """Pruebas estadísticas para diferencias significativas"""
+        from scipy import stats
         methods = self.results_df['method'].unique()
         test_results = []
         
@@ -118,11 +265,14 @@ class SortingBenchmarkAnalyzer:
         if not self.iteration_data:
             print("No hay datos de iteraciones para analizar")
             return
-            
-        plt.figure(figsize=(15, 10))
+        
+        plt, _ = plotting()
+        from statsmodels.tsa.stattools import adfuller
+        rows = (len(self.iteration_data) + 1) // 2
+        plt.figure(figsize=(15, 5 * rows))
         
         for i, (method, data) in enumerate(self.iteration_data.items(), 1):
-            plt.subplot(2, 2, i)
+            plt.subplot(rows, 2, i)
             plt.plot(data['iteration_times'], marker='o')
             
             # Test de estacionariedad
@@ -139,6 +289,7 @@ class SortingBenchmarkAnalyzer:
     
     def scalability_analysis(self):
         """Análisis empírico de la complejidad computacional"""
+        plt, sns = plotting()
         plt.figure(figsize=(12, 6))
         
         for method in self.results_df['method'].unique():
@@ -154,22 +305,250 @@ class SortingBenchmarkAnalyzer:
         plt.savefig(os.path.join(self.output_dir, 'scalability_analysis.png'))
         plt.close()
     
+    def has_memory_data(self):
+        return ('sort_py_peak' in self.results_df.columns and
+                self.results_df['sort_py_peak'].notna().any())
+    
+    def memory_analysis(self):
+        """Picos de memoria de ordenamiento (por algoritmo) y de exportación
+        (por algoritmo y formato), en MB"""
+        plt, sns = plotting()
+        df = self.results_df.copy()
+        for column in ['sort_rss_peak', 'sort_py_peak', 'export_rss_peak', 'export_py_peak']:
+            df[column] = df[column] / 2**20
+        plt.figure(figsize=(14, 7))
+        
+        plt.subplot(1, 2, 1)
+        sort_memory = df.groupby('method')[['sort_py_peak', 'sort_rss_peak']].max()
+        sort_memory.columns = ['tracemalloc (sobre el inicio)', 'RSS del proceso']
+        sort_memory.plot.bar(ax=plt.gca(), rot=0)
+        plt.title('Pico de Memoria al Ordenar')
+        plt.ylabel('Memoria (MB)')
+        plt.xlabel('Algoritmo')
+        
+        plt.subplot(1, 2, 2)
+        sns.barplot(x='method', y='export_py_peak', hue='format', data=df)
+        plt.title('Pico de Memoria al Exportar (tracemalloc)')
+        plt.ylabel('Memoria (MB)')
+        plt.xlabel('Algoritmo')
+        plt.legend(title='Formato')
+        
+        plt.tight_layout()
+        plt.savefig(os.path.join(self.output_dir, 'memory_analysis.png'))
+        plt.close()
+    
+    def memory_scaling(self):
+        """Pico de memoria (mediana de tracemalloc) por tamaño en los
+        resultados de benchmark.py; None si no se midió la memoria"""
+        df = self.benchmark_df
+        if df['py_peak'].isna().all():
+            return None
+        medians = df.groupby(['algorithm', 'distribution', 'size'])[
+            ['rss_peak', 'py_peak', 'py_blocks']].median().reset_index()
+        medians.to_csv(os.path.join(self.output_dir, 'memory_by_size.csv'), index=False)
+        
+        plt, _ = plotting()
+        plt.figure(figsize=(12, 6))
+        for (algorithm, distribution), group in medians.groupby(['algorithm', 'distribution']):
+            plt.loglog(group['size'], group['py_peak'] / 2**20, 'o-',
+                       label=f"{algorithm}/{distribution}")
+        plt.title('Pico de memoria por tamaño (tracemalloc, mediana)')
+        plt.xlabel('Filas (n)')
+        plt.ylabel('Memoria (MB)')
+        plt.legend(fontsize='small')
+        plt.grid(True, which='both')
+        plt.savefig(os.path.join(self.output_dir, 'memory_by_size.png'))
+        plt.close()
+        return medians
+    
+    def complexity_analysis(self, min_sizes=3):
+        """Ajusta n, n log n y n² a las medianas por tamaño de cada algoritmo
+        (y distribución) de los resultados de benchmark.py"""
+        df = self.benchmark_df
+        medians = df.groupby(['algorithm', 'distribution', 'size'])['seconds'].median().reset_index()
+        
+        plt, _ = plotting()
+        rows = []
+        plt.figure(figsize=(12, 6))
+        for (algorithm, distribution), group in medians.groupby(['algorithm', 'distribution']):
+            if group['size'].nunique() < min_sizes:
+                print(f"{algorithm}/{distribution}: menos de {min_sizes} tamaños, no se ajusta")
+                continue
+            fits = fit_complexity(group['size'], group['seconds'])
+            best = min(fits, key=lambda fit: fit['rel_rmse'])
+            for fit in fits:
+                rows.append({'algorithm': algorithm, 'distribution': distribution, **fit,
+                             'best': fit is best})
+            
+            line = plt.loglog(group['size'], group['seconds'], 'o',
+                              label=f"{algorithm}/{distribution}: {best['model']}")[0]
+            sizes = np.geomspace(group['size'].min(), group['size'].max(), 50)
+            plt.loglog(sizes, best['a'] + best['c'] * COMPLEXITY_MODELS[best['model']](sizes),
+                       '--', color=line.get_color())
+        
+        plt.title('Complejidad empírica (mediana por tamaño y mejor ajuste)')
+        plt.xlabel('Filas (n)')
+        plt.ylabel('Tiempo (s)')
+        plt.legend(fontsize='small')
+        plt.grid(True, which='both')
+        plt.savefig(os.path.join(self.output_dir, 'complexity_fit.png'))
+        plt.close()
+        
+        fits_df = pd.DataFrame(rows)
+        fits_df.to_csv(os.path.join(self.output_dir, 'complexity_fit.csv'), index=False)
+        if not fits_df.empty:
+            print(fits_df[fits_df['best']].drop(columns='best').to_string(index=False))
+        return fits_df
+    
+    def regression_check(self, baseline_path, threshold=0.10, alpha=0.05):
+        """Compara la corrida actual con una corrida base con Mann-Whitney U
+        (una cola) por algoritmo, distribución y tamaño.
+        
+        Hay regresión cuando la mediana empeora más que `threshold` (fracción)
+        y la diferencia es significativa (p < alpha). Con pocas repeticiones
+        el test no puede dar p chico: se necesitan al menos 4 por lado para
+        alpha=0.05.
+        """
+        from scipy import stats
+        from benchmark import load_results
+        baseline, _ = load_results(baseline_path)
+        keys = ['algorithm', 'distribution', 'size']
+        current_groups = dict(list(self.benchmark_df.groupby(keys)['seconds']))
+        
+        rows = []
+        for key, base_times in baseline.groupby(keys)['seconds']:
+            if key not in current_groups:
+                continue
+            times = current_groups[key]
+            base_median = base_times.median()
+            median = times.median()
+            slowdown = median / base_median - 1
+            p_value = stats.mannwhitneyu(times, base_times, alternative='greater').pvalue
+            rows.append({
+                **dict(zip(keys, key)),
+                'baseline_median': base_median,
+                'current_median': median,
+                'slowdown': slowdown,
+                'p_value': p_value,
+                'regression': bool(slowdown > threshold and p_value < alpha)
+            })
+        
+        check = pd.DataFrame(rows)
+        check.to_csv(os.path.join(self.output_dir, 'regression_check.csv'), index=False)
+        if check.empty:
+            print("No hay casos en común con la corrida base")
+        else:
+            regressions = check[check['regression']]
+            print(f"{len(check)} casos comparados, {len(regressions)} regresiones "
+                  f"(umbral {threshold:.0%}, alfa {alpha})")
+            if not regressions.empty:
+                print(regressions.to_string(index=False))
+        return check
+    
+    def stage_key(self, stage):
+        """Hash de lo que determina la salida de la etapa: sus datos de entrada,
+        la versión de la caché y, para el reporte, la plantilla"""
+        digest = hashlib.sha256(f"{stage}:{STAGE_CACHE_VERSION}".encode())
+        if stage == 'temporal':
+            digest.update(json.dumps(self.iteration_data, sort_keys=True, default=str).encode())
+        else:
+            digest.update(','.join(map(str, self.results_df.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(self.results_df, index=False).values.tobytes())
+        if stage == 'report':
+            with open(os.path.join(TEMPLATE_DIR, 'report_template.html'), 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+    
+    def run_stages(self, stages=None, workers=None, force=False):
+        """Corre las etapas pedidas (por defecto todas). Las etapas cuyas
+        entradas no cambiaron desde la corrida anterior se saltean (salvo con
+        force=True). Los gráficos se generan en paralelo en `workers` procesos
+        mientras el proceso principal calcula las estadísticas; con workers=0
+        todo corre en secuencia. El error de una etapa se informa y no corta
+        las demás."""
+        stages = [stage for stage in STAGES if (stages is None or stage in stages) and
+                  (stage != 'memory' or self.has_memory_data())]
+        keys = {stage: self.stage_key(stage) for stage in stages}
+        if not force:
+            cached = [stage for stage in stages if self.stage_cache.is_fresh(stage, keys[stage])]
+            if cached:
+                print(f"Sin cambios, se reutilizan: {', '.join(cached)}")
+            stages = [stage for stage in stages if stage not in cached]
+        plot_stages = [stage for stage in stages if stage in PLOT_STAGES]
+        titles = {
+            'stats': "Análisis Estadístico Básico",
+            'comparison': "Comparación de Rendimiento",
+            'tests': "Pruebas Estadísticas",
+            'temporal': "Análisis Temporal",
+            'scalability': "Análisis de Escalabilidad",
+            'memory': "Análisis de Memoria",
+            'report': "Generando Reporte Completo"
+        }
+        
+        pool = None
+        futures = {}
+        if workers != 0 and len(plot_stages) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(workers or len(plot_stages))
+            futures = {stage: pool.submit(_run_plot_stage, self, stage) for stage in plot_stages}
+        
+        try:
+            for stage in stages:
+                if stage in futures:
+                    continue
+                if stage == 'report':
+                    self._wait_plots(futures, keys)
+                print(f"\n=== {titles[stage]} ===")
+                # Una etapa que falla no impide correr las siguientes
+                try:
+                    if stage == 'stats':
+                        self.basic_statistical_analysis()
+                    elif stage == 'tests':
+                        self.statistical_tests()
+                    elif stage == 'report':
+                        self.generate_comprehensive_report()
+                    else:
+                        getattr(self, PLOT_STAGES[stage])()
+                    self.stage_cache.record(stage, keys[stage])
+                except Exception as e:
+                    print(f"Error en la etapa {stage}: {str(e)}")
+            self._wait_plots(futures, keys)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    
+    def _wait_plots(self, futures, keys):
+        while futures:
+            stage, future = futures.popitem()
+            try:
+                future.result()
+                self.stage_cache.record(stage, keys[stage])
+                print(f"Gráfico generado: {PLOT_STAGES[stage]}.png")
+            except Exception as e:
+                print(f"Error en la etapa {stage}: {str(e)}")
+    
     def generate_comprehensive_report(self):
         """Genera un reporte completo en HTML"""
         from jinja2 import Environment, FileSystemLoader
         import datetime
         
-        # Ruta completa al directorio que contiene el template
-        template_dir = r'C:\Users\Sebastian Gonzalez\OneDrive\Documentos\Visual Studio Code\ED2-PF-202510\threads_sockets'
+        # Las estadísticas se reutilizan si la etapa 'stats' ya las guardó
+        # para estos mismos datos
+        stats_path = os.path.join(self.output_dir, 'basic_stats.csv')
+        if self.stage_cache.is_fresh('stats', self.stage_key('stats')):
+            basic_stats = pd.read_csv(stats_path, header=[0, 1], index_col=0)
+        else:
+            basic_stats = self.basic_statistical_analysis()
         
         # Preparar datos para el reporte
         context = {
             'date': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'basic_stats': self.basic_statistical_analysis().to_html(),
+            'basic_stats': basic_stats.to_html(),
             'performance_plots': {
                 'comparison': 'performance_comparison.png',
                 'temporal': 'temporal_analysis.png',
-                'scalability': 'scalability_analysis.png'
+                'scalability': 'scalability_analysis.png',
+                'memory': 'memory_analysis.png' if self.has_memory_data() else None
             },
             'methods': self.results_df['method'].unique(),
             'formats': self.results_df['format'].unique()
@@ -177,7 +556,7 @@ class SortingBenchmarkAnalyzer:
         
         try:
             # Renderizar plantilla HTML
-            env = Environment(loader=FileSystemLoader(template_dir))
+            env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
             template = env.get_template('report_template.html')
             html_report = template.render(context)
             
@@ -190,35 +569,65 @@ class SortingBenchmarkAnalyzer:
             print(f"Error al generar el reporte: {str(e)}")
             raise
 
-def main():
+def benchmark_main(args):
+    """Análisis de resultados de benchmark.py; devuelve el código de salida"""
+    analyzer = SortingBenchmarkAnalyzer()
+    analyzer.load_benchmark(args.benchmark)
+    
+    print("=== Ajuste de Complejidad ===")
+    analyzer.complexity_analysis()
+    
+    if analyzer.memory_scaling() is not None:
+        print("\nPico de memoria por tamaño guardado en memory_by_size.png")
+    
+    if args.baseline:
+        print("\n=== Regresiones frente a la corrida base ===")
+        check = analyzer.regression_check(args.baseline, args.umbral, args.alfa)
+        if not check.empty and check['regression'].any():
+            return 1
+    return 0
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Análisis de los resultados del benchmark")
+    parser.add_argument('--benchmark', metavar='RUTA',
+                        help="Resultados de benchmark.py (JSON o Parquet) a analizar")
+    parser.add_argument('--baseline', metavar='RUTA',
+                        help="Corrida base; sale con código 1 si hay regresiones significativas")
+    parser.add_argument('--umbral', type=float, default=0.10,
+                        help="Empeoramiento mínimo de la mediana para contar como regresión (0.10 = 10%%)")
+    parser.add_argument('--alfa', type=float, default=0.05, help="Nivel de significancia")
+    parser.add_argument('--almacen', metavar='DIR', default=None,
+                        help="Lee los resultados del almacén Parquet en lugar de resultados_completos.csv")
+    parser.add_argument('--corridas', nargs='+', default=None,
+                        help="run_id a analizar del almacén (por defecto la última)")
+    parser.add_argument('--etapas', nargs='+', choices=STAGES, default=None,
+                        help="Etapas del análisis a correr (por defecto todas)")
+    parser.add_argument('--forzar', action='store_true',
+                        help="Recalcula todas las etapas aunque sus entradas no hayan cambiado")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos para los gráficos (0 = en secuencia)")
+    args = parser.parse_args(argv)
+    
+    if args.benchmark:
+        return benchmark_main(args)
+    
     try:
         analyzer = SortingBenchmarkAnalyzer()
-        analyzer.load_data()
+        if args.almacen:
+            analyzer.load_store(args.almacen, args.corridas)
+        else:
+            analyzer.load_data()
         
         if analyzer.results_df is None:
             print("No se pudieron cargar los datos para análisis")
             return
         
-        print("=== Análisis Estadístico Básico ===")
-        analyzer.basic_statistical_analysis()
-        
-        print("\n=== Comparación de Rendimiento ===")
-        analyzer.performance_comparison()
-        
-        print("\n=== Pruebas Estadísticas ===")
-        analyzer.statistical_tests()
-        
-        print("\n=== Análisis Temporal ===")
-        analyzer.temporal_analysis()
-        
-        print("\n=== Análisis de Escalabilidad ===")
-        analyzer.scalability_analysis()
-        
-        print("\n=== Generando Reporte Completo ===")
-        analyzer.generate_comprehensive_report()
+        analyzer.run_stages(args.etapas, args.workers, args.forzar)
         
     except Exception as e:
         print(f"Error durante el análisis: {str(e)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import sys
+    sys.exit(main())
\ No newline at end of file
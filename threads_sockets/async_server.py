@@ -0,0 +1,111 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from protocol import read_message_async, write_message_async, pack_message
+from server_side import process_request, error_response, reply_to, algorithm_label
+from metrics import RequestSpans, connection, start_metrics_server, watch_cache
+
+class AsyncSortingServer:
+    """Servidor asyncio: un solo event loop atiende todas las conexiones y el
+    trabajo de CPU (decodificar, ordenar, codificar) se delega a un executor.
+
+    Las conexiones se mantienen abiertas entre peticiones hasta que el cliente
+    cierra o pasan `idle_timeout` segundos sin que empiece otra petición (un
+    mensaje ya empezado se recibe completo aunque llegue lento). No hay fase
+    accept_wait: el event loop atiende la conexión apenas la acepta.
+    """
+    def __init__(self, host='localhost', port=8080, executor=None, max_workers=4,
+                 backlog=1024, idle_timeout=60.0, backend=None):
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.idle_timeout = idle_timeout
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers)
+        self.backend = backend
+
+    async def handle_connection(self, reader, writer):
+        client_address = writer.get_extra_info('peername')
+        loop = asyncio.get_running_loop()
+        try:
+            with connection():
+                while True:
+                    spans = RequestSpans()
+                    try:
+                        request, body = await read_message_async(reader, spans.begin,
+                                                                 self.idle_timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if request is None:
+                        break
+                    spans.received()
+
+                    status = 'ok'
+                    try:
+                        try:
+                            response, result = await loop.run_in_executor(
+                                self.executor, process_request, request, body, self.backend,
+                                spans)
+                        except Exception as e:
+                            print(f"Error con cliente {client_address}: {str(e)}")
+                            response, result = error_response(e)
+                            status = 'error'
+
+                        with spans.phase('send'):
+                            await write_message_async(
+                                writer, *pack_message(reply_to(request, response), result))
+                    finally:
+                        spans.finish(algorithm_label(request), status)
+        except Exception as e:
+            print(f"Error con cliente {client_address}: {str(e)}")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port,
+                                            backlog=self.backlog)
+        print(f"Servidor asyncio escuchando en {self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False)
+
+def start_async_server(host='localhost', port=8080, max_workers=4, backlog=1024,
+                       idle_timeout=60.0, backend=None):
+    server = AsyncSortingServer(host, port, max_workers=max_workers, backlog=backlog,
+                                idle_timeout=idle_timeout, backend=backend)
+    asyncio.run(server.serve_forever())
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Servidor de ordenamiento asyncio")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=4, help="Hilos del executor de ordenamiento")
+    parser.add_argument('--backlog', type=int, default=1024)
+    parser.add_argument('--inactividad', type=float, default=60.0,
+                        help="Segundos sin peticiones antes de cerrar una conexión")
+    parser.add_argument('--procesos', type=int, default=0,
+                        help="Ordenar en un pool de N procesos (0: en hilos del executor)")
+    parser.add_argument('--cache-mb', type=int, default=0,
+                        help="Memoria para la caché de resultados en MB (0: sin caché)")
+    parser.add_argument('--metricas', type=int, default=0, metavar='PUERTO',
+                        help="Publica métricas Prometheus en http://host:PUERTO/metrics (0: no)")
+    args = parser.parse_args()
+
+    if args.metricas:
+        start_metrics_server(args.metricas, args.host)
+
+    backend = None
+    if args.procesos > 0:
+        from process_backend import ProcessSortBackend
+        backend = ProcessSortBackend(args.procesos)
+    if args.cache_mb > 0:
+        from result_cache import ResultCache
+        from server_side import LOCAL_BACKEND
+        backend = ResultCache(backend or LOCAL_BACKEND, args.cache_mb * 1024 ** 2)
+        watch_cache(backend)
+    start_async_server(args.host, args.port, args.workers, args.backlog, args.inactividad, backend)
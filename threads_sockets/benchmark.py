@@ -0,0 +1,304 @@
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import hashlib
+import platform
+import datetime
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from timing import measure_ns, gc_disabled
+from instrumentation import MEMORY_FIELDS, track_memory
+from threading_ed2 import ALGORITHMS
+from data_generator import generate_ventas, DISTRIBUTIONS
+
+# Benchmark de los algoritmos de ordenamiento: calentamiento, repeticiones
+# medidas con perf_counter_ns y el GC desactivado, barrido de tamaños de
+# entrada y resultados en un formato versionado (JSON y Parquet) que lee
+# SortingBenchmarkAnalyzer.load_benchmark.
+#
+# Cada fila de resultados es una repetición medida:
+#   schema_version, run_id, created_at, fingerprint_id, algorithm,
+#   distribution, size, column, repeat, time_ns, seconds,
+#   rss_peak, py_peak, py_blocks (vacías si no se midió la memoria)
+#
+# Versión 2: agrega las columnas de memoria. Los resultados de la versión 1
+# se siguen leyendo, con esas columnas vacías.
+
+SCHEMA_VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+
+RESULT_SCHEMA = pa.schema([
+    ('schema_version', pa.int32()),
+    ('run_id', pa.string()),
+    ('created_at', pa.string()),
+    ('fingerprint_id', pa.string()),
+    ('algorithm', pa.string()),
+    ('distribution', pa.string()),
+    ('size', pa.int64()),
+    ('column', pa.string()),
+    ('repeat', pa.int32()),
+    ('time_ns', pa.int64()),
+    ('seconds', pa.float64()),
+    ('rss_peak', pa.int64()),
+    ('py_peak', pa.int64()),
+    ('py_blocks', pa.int64())
+])
+
+def size_sweep(min_exp=2, max_exp=7, steps_per_decade=1):
+    """Tamaños en escala logarítmica: 10^min_exp ... 10^max_exp"""
+    exps = np.linspace(min_exp, max_exp, (max_exp - min_exp) * steps_per_decade + 1)
+    return sorted({int(round(10 ** e)) for e in exps})
+
+def machine_fingerprint():
+    """Datos de la máquina y del entorno que afectan los tiempos medidos"""
+    import psutil
+    cpu_model = platform.processor()
+    try:
+        with open('/proc/cpuinfo') as f:
+            for line in f:
+                if line.startswith('model name'):
+                    cpu_model = line.split(':', 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    freq = psutil.cpu_freq()
+    fingerprint = {
+        'hostname': socket.gethostname(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_model': cpu_model,
+        'cpu_count': os.cpu_count(),
+        'cpu_count_physical': psutil.cpu_count(logical=False),
+        'cpu_freq_max_mhz': freq.max if freq else None,
+        'memory_total': psutil.virtual_memory().total,
+        'python': sys.version.split()[0],
+        'python_implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'pyarrow': pa.__version__
+    }
+    payload = json.dumps({k: v for k, v in fingerprint.items() if k != 'hostname'},
+                         sort_keys=True)
+    fingerprint['fingerprint_id'] = hashlib.sha256(payload.encode()).hexdigest()[:16]
+    return fingerprint
+
+def resample_dataset(df, size, seed=0):
+    """Toma `size` filas al azar (con reposición) de df"""
+    rng = np.random.default_rng(seed)
+    return df.take(rng.integers(0, len(df), size)).reset_index(drop=True)
+
+class BenchmarkRunner:
+    """Corre cada algoritmo sobre cada tamaño: `warmup` ejecuciones sin medir y
+    `repeat` medidas. Si la mediana de un tamaño supera `max_seconds`, el
+    algoritmo no se prueba con tamaños mayores. Con memory=True cada
+    repetición mide también el pico de memoria (ver instrumentation)."""
+    def __init__(self, algorithms=None, sizes=None, warmup=1, repeat=5,
+                 column='FECHA_VENTA', max_seconds=None, run_id=None, memory=False):
+        self.algorithms = algorithms or dict(ALGORITHMS)
+        self.sizes = sizes or size_sweep()
+        self.warmup = warmup
+        self.repeat = repeat
+        self.column = column
+        self.max_seconds = max_seconds
+        self.memory = memory
+        self.run_id = run_id or datetime.datetime.now().strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+        self.created_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        self.fingerprint = machine_fingerprint()
+
+    def config(self):
+        return {
+            'algorithms': list(self.algorithms),
+            'sizes': list(self.sizes),
+            'warmup': self.warmup,
+            'repeat': self.repeat,
+            'column': self.column,
+            'max_seconds': self.max_seconds,
+            'memory': self.memory
+        }
+
+    def measure(self, func, df):
+        """Devuelve los tiempos (ns) y la memoria (MemoryStats) de las
+        repeticiones medidas"""
+        # Los algoritmos vienen decorados con timeit; se mide la función original
+        func = getattr(func, '__wrapped__', func)
+        for _ in range(self.warmup):
+            func(df, self.column)
+        times = []
+        memories = []
+        for _ in range(self.repeat):
+            with track_memory(enabled=self.memory) as memory, gc_disabled():
+                result, elapsed = measure_ns(func, df, self.column)
+            del result
+            times.append(elapsed)
+            memories.append(memory)
+        return times, memories
+
+    def run(self, make_input, distribution='resample'):
+        """`make_input(size)` devuelve el DataFrame de entrada de cada tamaño"""
+        records = []
+        skipped = set()
+        for size in self.sizes:
+            df = None
+            for name, func in self.algorithms.items():
+                if name in skipped:
+                    continue
+                if df is None:
+                    df = make_input(size)
+                times, memories = self.measure(func, df)
+                median = float(np.median(times)) / 1e9
+                line = f"{name:>8} n={size:<10} mediana {median:.6f}s"
+                if self.memory:
+                    line += f" pico {max(m.py_peak for m in memories) / 2**20:.1f}MB"
+                print(line)
+                records.extend({
+                    'schema_version': SCHEMA_VERSION,
+                    'run_id': self.run_id,
+                    'created_at': self.created_at,
+                    'fingerprint_id': self.fingerprint['fingerprint_id'],
+                    'algorithm': name,
+                    'distribution': distribution,
+                    'size': size,
+                    'column': self.column,
+                    'repeat': i,
+                    'time_ns': t,
+                    'seconds': t / 1e9,
+                    **memory.as_dict()
+                } for i, (t, memory) in enumerate(zip(times, memories)))
+                if self.max_seconds is not None and median > self.max_seconds:
+                    print(f"{name}: se omiten los tamaños mayores a {size}")
+                    skipped.add(name)
+            del df
+        return records
+
+    def write(self, records, output_dir):
+        """Guarda los resultados en benchmark_<run_id>.json y .parquet"""
+        os.makedirs(output_dir, exist_ok=True)
+        metadata = {
+            'schema_version': SCHEMA_VERSION,
+            'run_id': self.run_id,
+            'created_at': self.created_at,
+            'fingerprint': self.fingerprint,
+            'config': self.config()
+        }
+        base = os.path.join(output_dir, f"benchmark_{self.run_id}")
+        with open(base + '.json', 'w') as f:
+            json.dump({**metadata, 'results': records}, f, indent=2)
+
+        table = pa.Table.from_pylist(records, schema=RESULT_SCHEMA)
+        table = table.replace_schema_metadata({'benchmark': json.dumps(metadata)})
+        pq.write_table(table, base + '.parquet')
+        return base + '.json', base + '.parquet'
+
+def load_results(path):
+    """Lee un resultado de benchmark (JSON o Parquet) y verifica su versión.
+
+    Devuelve (DataFrame de repeticiones, metadatos de la corrida).
+    """
+    if path.endswith('.json'):
+        with open(path) as f:
+            data = json.load(f)
+        records = data.pop('results')
+        metadata = data
+        df = pa.Table.from_pylist(records, schema=RESULT_SCHEMA).to_pandas()
+    else:
+        table = pq.read_table(path)
+        metadata = json.loads(table.schema.metadata[b'benchmark'])
+        df = table.to_pandas()
+    if metadata.get('schema_version') not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Versión de resultados no soportada en {path}: "
+                         f"{metadata.get('schema_version')}")
+    return df.reindex(columns=RESULT_SCHEMA.names), metadata
+
+def generated_inputs(distributions=None, seed=0):
+    """Entradas del generador: {distribución: make_input(size)}"""
+    return {distribution: (lambda size, d=distribution: generate_ventas(size, d, seed))
+            for distribution in distributions or DISTRIBUTIONS}
+
+def to_store_samples(records):
+    """Convierte las mediciones al formato del almacén de resultados"""
+    return [{'run_id': r['run_id'], 'method': r['algorithm'], 'size': r['size'],
+             'stage': 'sort', 'distribution': r['distribution'], 'iteration': r['repeat'],
+             'seconds': r['seconds'], **{field: r.get(field) for field in MEMORY_FIELDS}}
+            for r in records]
+
+def main(inputs, algorithms=None, sizes=None, warmup=1, repeat=5, max_seconds=None,
+         output_dir='benchmarks', store=None, memory=False):
+    """`inputs` es {nombre de distribución: make_input(size)}; con `store`
+    (ResultsStore) las mediciones también se agregan al almacén"""
+    runner = BenchmarkRunner(algorithms, sizes, warmup, repeat, max_seconds=max_seconds,
+                             memory=memory)
+    print(f"Corrida {runner.run_id} en {runner.fingerprint['cpu_model']} "
+          f"({runner.fingerprint['cpu_count']} CPU)")
+    start_time = time.perf_counter()
+    records = []
+    for distribution, make_input in inputs.items():
+        print(f"\nDistribución: {distribution}")
+        records.extend(runner.run(make_input, distribution))
+    json_path, parquet_path = runner.write(records, output_dir)
+    if store is not None:
+        store.append(to_store_samples(records))
+    print(f"\n{len(records)} mediciones en {time.perf_counter() - start_time:.1f}s")
+    print(f"Resultados guardados en: {json_path} y {parquet_path}")
+    return records
+
+if __name__ == "__main__":
+    import argparse
+    from sql_connection import open_backend, load_ventas
+    from dataset_cache import DatasetCache
+    from results_store import ResultsStore
+
+    parser = argparse.ArgumentParser(description="Benchmark de ordenamiento por tamaño de entrada")
+    parser.add_argument('--algoritmos', nargs='+', choices=list(ALGORITHMS), default=None)
+    parser.add_argument('--tamanos', nargs='+', type=int, default=None,
+                        help="Tamaños exactos (por defecto barrido de 10^min a 10^max)")
+    parser.add_argument('--min-exp', type=int, default=2)
+    parser.add_argument('--max-exp', type=int, default=7)
+    parser.add_argument('--pasos', type=int, default=1, help="Tamaños por década")
+    parser.add_argument('--calentamiento', type=int, default=1, help="Ejecuciones sin medir")
+    parser.add_argument('--repeticiones', type=int, default=5, help="Ejecuciones medidas")
+    parser.add_argument('--limite-segundos', type=float, default=5.0,
+                        help="Deja de agrandar el tamaño cuando la mediana lo supera")
+    parser.add_argument('--salida', default='benchmarks', help="Directorio de resultados")
+    parser.add_argument('--almacen', metavar='DIR', default=None,
+                        help="Agrega también las mediciones al almacén Parquet particionado")
+    parser.add_argument('--memoria-pico', action='store_true',
+                        help="Mide también el pico de RSS y de tracemalloc de cada repetición "
+                             "(los tiempos medidos así son más lentos)")
+    parser.add_argument('--distribuciones', nargs='+', choices=DISTRIBUTIONS, default=None,
+                        help="Genera las entradas con estas distribuciones en lugar de leer la base")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla del generador")
+    parser.add_argument('--backend', choices=['mysql', 'sqlite'], default='mysql')
+    parser.add_argument('--filas-sqlite', type=int, default=10000)
+    parser.add_argument('--cache-datos', metavar='DIR', default=None,
+                        help="Caché local de los datos leídos de la base")
+    args = parser.parse_args()
+
+    algorithms = {name: ALGORITHMS[name] for name in args.algoritmos} if args.algoritmos else None
+    sizes = args.tamanos or size_sweep(args.min_exp, args.max_exp, args.pasos)
+
+    if args.distribuciones:
+        inputs = generated_inputs(args.distribuciones, args.semilla)
+    else:
+        if args.backend == 'sqlite':
+            backend = open_backend('sqlite', rows=args.filas_sqlite, seed=args.semilla)
+        else:
+            backend = open_backend('mysql')
+        if backend is None:
+            raise SystemExit(1)
+        try:
+            cache = DatasetCache(args.cache_datos) if args.cache_datos else None
+            source = load_ventas(backend, cache=cache)
+        finally:
+            backend.close()
+        if source is None:
+            raise SystemExit(1)
+        inputs = {'resample': lambda size: resample_dataset(source, size, args.semilla)}
+
+    main(inputs, algorithms, sizes, args.calentamiento, args.repeticiones,
+         args.limite_segundos, args.salida,
+         ResultsStore(args.almacen) if args.almacen else None, args.memoria_pico)
@@ -1,80 +1,85 @@
 import pandas as pd
 import time
-import os
-import json
-import fastavro
-import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from exporters import export_dataframe, export_filename
+
+# Formatos que compara compare_export_methods (nombres del registro de exporters)
+COMPARED_FORMATS = ['CSV', 'JSON', 'PARQUET', 'AVRO']
 
 def export_to_csv(df, filename):
     """Exportar DataFrame a CSV"""
-    start = time.time()
-    df.to_csv(filename, index=False)
-    size = os.path.getsize(filename)
-    return time.time() - start, size
+    return export_dataframe('CSV', df, filename)
 
 def export_to_json(df, filename):
     """Exportar DataFrame a JSON"""
-    start = time.time()
-    df.to_json(filename, orient='records')
-    size = os.path.getsize(filename)
-    return time.time() - start, size
+    return export_dataframe('JSON', df, filename)
 
 def export_to_parquet(df, filename):
     """Exportar DataFrame a Parquet"""
-    start = time.time()
-    df.to_parquet(filename, engine='pyarrow')
-    size = os.path.getsize(filename)
-    return time.time() - start, size
+    return export_dataframe('PARQUET', df, filename)
+
+def export_to_avro(df, filename, codec='none', block_rows=10000):
+    """Exportar DataFrame a Avro, un bloque Avro por cada `block_rows` filas"""
+    return export_dataframe('AVRO', df, filename, codec=codec, row_group_size=block_rows)
+
+# DataFrame de los procesos del pool. No es memoria compartida: el initializer
+# recibe el DataFrame serializado con pickle y cada worker guarda su propia copia
+# (una copia por proceso, no una por formato).
+_worker_df = None
+
+def _init_worker(df):
+    global _worker_df
+    _worker_df = df
+
+def run_export(format_type, df, filename):
+    """Ejecuta un exportador y devuelve su fila de resultados (o el error).
+    Con df=None usa la copia del DataFrame del proceso del pool."""
+    try:
+        time_taken, size = export_dataframe(format_type, _worker_df if df is None else df,
+                                            filename)
+        return {'format': format_type, 'time': time_taken, 'size': size}
+    except Exception as e:
+        print(f"❌ Error exportando a {format_type}: {str(e)}")
+        return {'format': format_type, 'error': str(e)}
+
+def compare_export_methods(df, base_filename='ventas', concurrent=False, max_workers=None,
+                           use_processes=False):
+    """Comparar los 4 métodos de exportación con manejo de errores.
+
+    Con concurrent=True los formatos se escriben a la vez en un pool de hilos
+    sobre el mismo DataFrame, que ningún exportador modifica, o en un pool de
+    procesos con use_processes=True (cada proceso recibe una copia del
+    DataFrame). Un formato que falla queda con su 'error' y no corta a los
+    demás. 'time' es el costo de cada formato y 'wall_time' el tiempo total de
+    punta a punta de la comparación.
+    """
+    wall_start = time.time()
+    jobs = [(format_type, export_filename(format_type, base_filename))
+            for format_type in COMPARED_FORMATS]
 
-def export_to_avro(df, filename):
-    """Exportar DataFrame a Avro"""
-    start = time.time()
-    
-    # Definir schema Avro
-    schema = {
-        'type': 'record',
-        'name': 'Venta',
-        'fields': [
-            {'name': 'ID_VENTA', 'type': 'string'},
-            {'name': 'FECHA_VENTA', 'type': 'string'},
-            {'name': 'ID_CLIENTE', 'type': 'int'},
-            {'name': 'ID_EMPLEADO', 'type': 'int'},
-            {'name': 'ID_PRODUCTO', 'type': 'int'},
-            {'name': 'CANTIDAD', 'type': 'int'},
-            {'name': 'PRECIO_UNITARIO', 'type': 'double'},
-            {'name': 'DESCUENTO', 'type': 'double'},
-            {'name': 'FORMA_PAGO', 'type': 'string'}
-        ]
-    }
-    
-    # Convertir DataFrame a registros Avro
-    records = df.to_dict('records')
-    
-    # Escribir archivo Avro
-    with open(filename, 'wb') as out:
-        fastavro.writer(out, schema, records)
-    
-    size = os.path.getsize(filename)
-    return time.time() - start, size
+    if not concurrent:
+        results = [run_export(format_type, df, filename) for format_type, filename in jobs]
+    else:
+        workers = max_workers or len(jobs)
+        if use_processes:
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(df,))
+            shared = None
+        else:
+            pool = ThreadPoolExecutor(workers)
+            shared = df
+        with pool:
+            futures = [pool.submit(run_export, format_type, shared, filename)
+                       for format_type, filename in jobs]
+        results = []
+        for (format_type, _), future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # El proceso del pool falló antes de poder reportar el error
+                print(f"❌ Error exportando a {format_type}: {str(e)}")
+                results.append({'format': format_type, 'error': str(e)})
 
-def compare_export_methods(df, base_filename='ventas'):
-    """Comparar los 4 métodos de exportación"""
-    results = []
-    
-    # CSV
-    time_taken, size = export_to_csv(df, f"{base_filename}.csv")
-    results.append({'format': 'CSV', 'time': time_taken, 'size': size})
-    
-    # JSON
-    time_taken, size = export_to_json(df, f"{base_filename}.json")
-    results.append({'format': 'JSON', 'time': time_taken, 'size': size})
-    
-    # Parquet
-    time_taken, size = export_to_parquet(df, f"{base_filename}.parquet")
-    results.append({'format': 'Parquet', 'time': time_taken, 'size': size})
-    
-    # Avro
-    time_taken, size = export_to_avro(df, f"{base_filename}.avro")
-    results.append({'format': 'Avro', 'time': time_taken, 'size': size})
-    
-    return pd.DataFrame(results)
\ No newline at end of file
+    wall_time = time.time() - wall_start
+    for result in results:
+        result['wall_time'] = wall_time
+    return pd.DataFrame(results)
@@ -0,0 +1,75 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Generador vectorizado de datos con la forma de VENTAS para los benchmarks.
+# La distribución controla el orden y la repetición de FECHA_VENTA (la clave
+# de ordenamiento); el resto de las columnas es aleatorio. Con la misma
+# semilla se obtienen exactamente los mismos datos.
+#
+#   random         fechas uniformes
+#   presorted      ya ordenadas
+#   reverse        ordenadas de mayor a menor
+#   nearly_sorted  ordenadas con una fracción `disorder` de pares intercambiados
+#   duplicates     solo `distinct` fechas distintas
+#   zipf           pocas fechas concentran la mayoría de las ventas
+
+DISTRIBUTIONS = ['random', 'presorted', 'reverse', 'nearly_sorted', 'duplicates', 'zipf']
+
+BASE_DATE = np.datetime64('2020-01-01', 'D')
+PAGOS = ['EFECTIVO', 'TARJETA', 'TRANSFERENCIA']
+
+def date_offsets(rng, rows, distribution='random', span_days=5 * 365, disorder=0.01,
+                 distinct=10, zipf_a=1.5):
+    """Días desde BASE_DATE para cada fila según la distribución"""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Distribución no soportada: {distribution}")
+    if distribution == 'duplicates':
+        values = rng.choice(span_days, size=min(distinct, span_days), replace=False)
+        return values[rng.integers(0, len(values), rows)]
+    if distribution == 'zipf':
+        # Rango de popularidad -> día, con los días populares repartidos al azar
+        ranks = (rng.zipf(zipf_a, rows) - 1) % span_days
+        return rng.permutation(span_days)[ranks]
+
+    days = rng.integers(0, span_days, rows)
+    if distribution == 'random':
+        return days
+    days.sort()
+    if distribution == 'reverse':
+        return days[::-1].copy()
+    if distribution == 'nearly_sorted':
+        swaps = int(rows * disorder) // 2
+        if swaps:
+            left = rng.integers(0, rows, swaps)
+            right = rng.integers(0, rows, swaps)
+            days[left], days[right] = days[right], days[left]
+    return days
+
+def generate_ventas(rows, distribution='random', seed=0, as_arrow=False, **options):
+    """Genera `rows` filas de VENTAS.
+
+    Devuelve un DataFrame con los mismos tipos que load_ventas (o una tabla
+    Arrow con el schema VENTAS_SCHEMA si as_arrow=True). `options` se pasan a
+    date_offsets (span_days, disorder, distinct, zipf_a).
+    """
+    rng = np.random.default_rng(seed)
+    days = date_offsets(rng, rows, distribution, **options)
+
+    width = max(8, len(str(rows)))
+    ids = pc.utf8_lpad(pa.array(np.arange(1, rows + 1)).cast(pa.string()), width, '0')
+    pagos = pa.DictionaryArray.from_arrays(
+        pa.array(rng.integers(0, len(PAGOS), rows).astype(np.int8)), pa.array(PAGOS))
+
+    table = pa.table({
+        'ID_VENTA': pc.binary_join_element_wise('V', ids, ''),
+        'FECHA_VENTA': pa.array(BASE_DATE + days, type=pa.date32()),
+        'ID_CLIENTE': pa.array(rng.integers(1, 5000, rows, dtype=np.int32)),
+        'ID_EMPLEADO': pa.array(rng.integers(1, 200, rows, dtype=np.int32)),
+        'ID_PRODUCTO': pa.array(rng.integers(1, 1000, rows, dtype=np.int32)),
+        'CANTIDAD': pa.array(rng.integers(1, 20, rows, dtype=np.int32)),
+        'PRECIO_UNITARIO': pa.array(np.round(rng.uniform(1, 500, rows), 2)),
+        'DESCUENTO': pa.array(np.round(rng.uniform(0, 0.3, rows), 2)),
+        'FORMA_PAGO': pagos.cast(pa.string())
+    })
+    return table if as_arrow else table.to_pandas()
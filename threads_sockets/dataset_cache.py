@@ -0,0 +1,86 @@
+import os
+import time
+import json
+import hashlib
+import pyarrow as pa
+
+# Caché local de los datos leídos de la base. Cada consulta se guarda en un
+# archivo Arrow IPC (<clave>.arrow) cuya clave es un hash del origen, la
+# consulta, sus parámetros y el schema; las lecturas siguientes abren el
+# archivo con memory_map, sin copiar los buffers.
+#
+# Un archivo vence después de `ttl` segundos (según su fecha de
+# modificación); invalidate() borra una entrada o todas.
+
+class DatasetCache:
+    def __init__(self, directory, ttl=None):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(source, query, params, schema):
+        schema_hash = hashlib.sha256(schema.serialize().to_pybytes()).hexdigest()
+        payload = json.dumps([source, query, [str(p) for p in params], schema_hash])
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.arrow")
+
+    def is_fresh(self, key):
+        try:
+            mtime = os.path.getmtime(self.path(key))
+        except OSError:
+            return False
+        return self.ttl is None or time.time() - mtime < self.ttl
+
+    def get(self, key):
+        """Devuelve la tabla guardada (memory-mapped) o None si no existe o venció"""
+        if not self.is_fresh(key):
+            self.invalidate(key)
+            return None
+        try:
+            source = pa.memory_map(self.path(key))
+            return pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid) as e:
+            print(f"Entrada de caché inválida {key}: {e}")
+            self.invalidate(key)
+            return None
+
+    def store(self, key, batches, schema, description=None):
+        """Reenvía los RecordBatch de `batches` mientras los escribe en la caché.
+
+        El archivo se publica solo si se consumieron todos los bloques; si la
+        lectura falla o se corta antes, la entrada parcial se descarta.
+        """
+        tmp_path = self.path(key) + f".{os.getpid()}.tmp"
+        if description is not None:
+            schema = schema.with_metadata({**(schema.metadata or {}),
+                                           b'cache_description': description.encode()})
+        complete = False
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, schema) as writer:
+                    for batch in batches:
+                        writer.write_batch(batch.replace_schema_metadata(schema.metadata))
+                        yield batch
+            os.replace(tmp_path, self.path(key))
+            complete = True
+        finally:
+            if not complete and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def invalidate(self, key=None):
+        """Borra la entrada `key` o, sin clave, todas las de la caché"""
+        if key is not None:
+            names = [f"{key}.arrow"]
+        else:
+            names = [name for name in os.listdir(self.directory) if name.endswith('.arrow')]
+        removed = 0
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
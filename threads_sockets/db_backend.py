@@ -0,0 +1,204 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+import datetime
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from data_generator import generate_ventas
+
+# Capa de acceso a la base de datos: un pool de conexiones genérico y dos
+# backends con la misma interfaz (MySQL en RDS y SQLite local para pruebas).
+#
+# Interfaz de un backend:
+#   connection()          -> context manager que presta una conexión del pool
+#   stream_cursor(cnx)    -> cursor que no carga todo el resultado en memoria
+#   placeholder           -> marcador de parámetros de la consulta ('%s' o '?')
+#   Error                 -> clase base de los errores del driver
+#   source                -> identificador del origen de datos (para la caché local)
+#   close()
+
+class ConnectionPool:
+    """Pool de conexiones con tamaño máximo, reciclado por antigüedad y
+    verificación de salud antes de prestar una conexión inactiva."""
+    def __init__(self, factory, size=5, recycle=3600, is_alive=None, timeout=30):
+        self.factory = factory
+        self.recycle = recycle
+        self.is_alive = is_alive
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.slots = threading.BoundedSemaphore(size)
+
+    def _new(self):
+        return self.factory(), time.monotonic()
+
+    def _discard(self, cnx):
+        try:
+            cnx.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """Devuelve (conexión, momento de creación)"""
+        if not self.slots.acquire(timeout=self.timeout):
+            raise TimeoutError("No hay conexiones libres en el pool")
+        try:
+            try:
+                cnx, created = self.idle.get_nowait()
+            except queue.Empty:
+                return self._new()
+
+            if self.recycle and time.monotonic() - created > self.recycle:
+                self._discard(cnx)
+                return self._new()
+            if self.is_alive is not None and not self.is_alive(cnx):
+                self._discard(cnx)
+                return self._new()
+            return cnx, created
+        except Exception:
+            self.slots.release()
+            raise
+
+    def release(self, cnx, created, broken=False):
+        if broken:
+            self._discard(cnx)
+        else:
+            self.idle.put((cnx, created))
+        self.slots.release()
+
+    @contextmanager
+    def connection(self):
+        cnx, created = self.acquire()
+        broken = False
+        try:
+            yield cnx
+        except BaseException:
+            # También GeneratorExit: un generador de filas que se cierra antes de
+            # terminar deja resultados sin leer en la conexión y no se reutiliza
+            broken = True
+            raise
+        finally:
+            self.release(cnx, created, broken)
+
+    def close(self):
+        while True:
+            try:
+                cnx, _ = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(cnx)
+
+def mysql_config():
+    """Lee las credenciales de .env en el momento de conectar (no al importar)"""
+    load_dotenv()
+    return {
+        "user": os.environ['DATABASE_USERNAME'],
+        "password": os.environ['DATABASE_PASSWORD'],
+        "host": os.environ['DATABASE_HOST'],
+        "database": os.environ['DATABASE_NAME'],
+        "charset": 'utf8'
+    }
+
+class MySQLBackend:
+    placeholder = '%s'
+
+    def __init__(self, pool_size=5, recycle=3600, config=None):
+        from mysql.connector import connect, Error
+        self.Error = Error
+        self.config = config or mysql_config()
+        self.source = f"mysql://{self.config['host']}/{self.config['database']}"
+        self.pool = ConnectionPool(lambda: connect(**self.config), pool_size, recycle,
+                                   is_alive=lambda cnx: cnx.is_connected())
+
+    def connection(self):
+        return self.pool.connection()
+
+    def stream_cursor(self, cnx):
+        return cnx.cursor(buffered=False)
+
+    def close(self):
+        self.pool.close()
+
+class SQLiteBackend:
+    """Base SQLite en memoria (o en `path`) con una tabla VENTAS de ejemplo,
+    para correr el pipeline y los benchmarks sin red."""
+    placeholder = '?'
+    Error = sqlite3.Error
+
+    def __init__(self, path=None, rows=10000, seed=0, pool_size=5, distribution='random'):
+        if path is None:
+            # Base en memoria compartida entre las conexiones del pool
+            self.uri = f"file:ventas_{id(self)}?mode=memory&cache=shared"
+            self.source = f"sqlite:memory?rows={rows}&seed={seed}&distribution={distribution}"
+        else:
+            self.uri = f"file:{path}"
+            self.source = f"sqlite:{os.path.abspath(path)}"
+        # Mantiene viva la base en memoria mientras exista el backend
+        self.anchor = self._connect()
+        # Una base en archivo ya cargada se reutiliza tal cual
+        if rows and self.is_empty():
+            df = generate_ventas(rows, distribution, seed)
+            self.load_ventas(df.itertuples(index=False, name=None))
+        self.pool = ConnectionPool(self._connect, pool_size, recycle=0,
+                                   is_alive=self._is_alive)
+
+    def _connect(self):
+        return sqlite3.connect(self.uri, uri=True, check_same_thread=False,
+                               detect_types=sqlite3.PARSE_DECLTYPES)
+
+    @staticmethod
+    def _is_alive(cnx):
+        try:
+            cnx.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def create_table(self):
+        with self.anchor:
+            self.anchor.execute("""
+                CREATE TABLE IF NOT EXISTS VENTAS (
+                    ID_VENTA TEXT PRIMARY KEY,
+                    FECHA_VENTA DATE,
+                    ID_CLIENTE INTEGER,
+                    ID_EMPLEADO INTEGER,
+                    ID_PRODUCTO INTEGER,
+                    CANTIDAD INTEGER,
+                    PRECIO_UNITARIO REAL,
+                    DESCUENTO REAL,
+                    FORMA_PAGO TEXT
+                )""")
+
+    def is_empty(self):
+        """True si la tabla VENTAS (que se crea si no existe) no tiene filas"""
+        self.create_table()
+        return self.anchor.execute("SELECT 1 FROM VENTAS LIMIT 1").fetchone() is None
+
+    def load_ventas(self, rows):
+        """Crea (si hace falta) la tabla VENTAS e inserta las filas dadas"""
+        self.create_table()
+        with self.anchor:
+            self.anchor.executemany("INSERT INTO VENTAS VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def connection(self):
+        return self.pool.connection()
+
+    def stream_cursor(self, cnx):
+        return cnx.cursor()
+
+    def close(self):
+        self.pool.close()
+        self.anchor.close()
+
+# SQLite guarda las fechas como texto ISO
+sqlite3.register_adapter(datetime.date, lambda d: d.isoformat())
+sqlite3.register_converter("DATE", lambda b: datetime.date.fromisoformat(b.decode()))
+
+def get_backend(name='mysql', **kwargs):
+    """Crea el backend indicado: 'mysql' o 'sqlite'"""
+    if name == 'mysql':
+        return MySQLBackend(**kwargs)
+    if name == 'sqlite':
+        return SQLiteBackend(**kwargs)
+    raise ValueError(f"Backend no soportado: {name}")
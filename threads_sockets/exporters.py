@@ -0,0 +1,466 @@
+import abc
+import io
+import importlib.util
+import os
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Escritores incrementales para el benchmark de sql_connection: cada iteración se
+# escribe (y se libera) apenas se produce, en lugar de juntar todas las copias
+# ordenadas con pd.concat y escribirlas al final.
+#
+# Interfaz: write(df) agrega un bloque y close() devuelve
+# (ruta, tamaño, tiempo de escritura) o (None, None, None) si hubo error.
+# read(path, codec) vuelve a leer el archivo como DataFrame.
+#
+# Opciones comunes (cada formato usa las que le aplican):
+#   codec           'none', 'gzip', 'snappy', 'zstd' o 'lz4' (ver `codecs`)
+#   level           nivel de compresión del codec; solo se aplica donde
+#                   supports_level(codec) es True (nunca en CSV/TXT/JSON ni ORC)
+#   row_group_size  filas por row group/stripe; por defecto uno por bloque
+#   dictionary      codificación por diccionario de las columnas repetitivas
+
+CODECS = ['none', 'gzip', 'snappy', 'zstd', 'lz4']
+
+# Sufijo que se agrega a los formatos de texto comprimidos
+TEXT_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst', 'lz4': '.lz4'}
+
+class ChunkWriter(abc.ABC):
+    extension = None
+    codecs = ('none',)
+
+    def __init__(self, path, codec='none', level=None, row_group_size=None, dictionary=True):
+        if codec not in self.codecs:
+            raise ValueError(f"Codec {codec} no soportado para {type(self).__name__}")
+        self.path = path
+        self.codec = codec
+        self.level = level
+        self.row_group_size = row_group_size
+        self.dictionary = dictionary
+        self.elapsed = 0.0
+        self.error = None
+
+    def write(self, df):
+        if self.error is not None:
+            return
+        start = time.perf_counter()
+        try:
+            self._write(df)
+        except Exception as e:
+            self.error = e
+            print(f"Error escribiendo {self.path}: {str(e)}")
+        self.elapsed += time.perf_counter() - start
+
+    def close(self):
+        start = time.perf_counter()
+        try:
+            self._close()
+        except Exception as e:
+            if self.error is None:
+                self.error = e
+                print(f"Error cerrando {self.path}: {str(e)}")
+        self.elapsed += time.perf_counter() - start
+        if self.error is not None:
+            return None, None, None
+        return self.path, os.path.getsize(self.path), self.elapsed
+
+    @abc.abstractmethod
+    def _write(self, df):
+        pass
+
+    def _close(self):
+        pass
+
+    @classmethod
+    def supports_level(cls, codec):
+        """True si el formato aplica `level` con este codec"""
+        return False
+
+    @staticmethod
+    @abc.abstractmethod
+    def read(path, codec='none'):
+        pass
+
+def _open_text(path, codec):
+    # Los flujos comprimidos de Arrow usan el nivel por defecto del codec
+    if codec == 'none':
+        return open(path, 'w', newline='')
+    stream = pa.CompressedOutputStream(path, codec)
+    return io.TextIOWrapper(stream, encoding='utf-8', newline='')
+
+def _read_text(path, codec):
+    return pa.input_stream(path, compression=None if codec == 'none' else codec)
+
+class CSVWriter(ChunkWriter):
+    """CSV: la cabecera solo va en el primer bloque"""
+    extension = 'csv'
+    codecs = ('none', 'gzip', 'zstd', 'lz4')
+    sep = ','
+
+    def __init__(self, path, **options):
+        super().__init__(path, **options)
+        self.file = _open_text(path, self.codec)
+        self.header = True
+
+    def _write(self, df):
+        df.to_csv(self.file, index=False, sep=self.sep, header=self.header)
+        self.header = False
+
+    def _close(self):
+        self.file.close()
+
+    @classmethod
+    def read(cls, path, codec='none'):
+        with _read_text(path, codec) as source:
+            return pd.read_csv(source, sep=cls.sep)
+
+class TXTWriter(CSVWriter):
+    """Texto separado por tabulaciones"""
+    extension = 'txt'
+    sep = '\t'
+
+class JSONWriter(ChunkWriter):
+    """JSON guarda solo el último bloque para evitar archivos muy grandes: cada
+    bloque reescribe el archivo, así no queda ninguna referencia al bloque
+    mientras se produce el siguiente. Fechas en ISO 8601"""
+    extension = 'json'
+    codecs = ('none', 'gzip', 'zstd', 'lz4')
+
+    def __init__(self, path, **options):
+        super().__init__(path, **options)
+        self.written = False
+
+    def _write(self, df):
+        with _open_text(self.path, self.codec) as f:
+            df.to_json(f, orient='records', date_format='iso')
+        self.written = True
+
+    def _close(self):
+        if not self.written:
+            with _open_text(self.path, self.codec) as f:
+                f.write('[]')
+
+    @staticmethod
+    def read(path, codec='none'):
+        with _read_text(path, codec) as source:
+            return pd.read_json(io.BytesIO(source.read()), orient='records')
+
+class ArrowWriter(ChunkWriter):
+    """Base de los formatos columnares: convierte cada bloque a una tabla
+    Arrow con el schema del primer bloque"""
+    def __init__(self, path, **options):
+        super().__init__(path, **options)
+        self.writer = None
+        self.schema = None
+
+    def _table(self, df):
+        if self.schema is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self.schema = table.schema
+            return table
+        return pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+
+    def _write(self, df):
+        table = self._table(df)
+        if self.writer is None:
+            self.writer = self._open(self.schema)
+        self._write_table(table)
+
+    def _close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+class ParquetWriter(ArrowWriter):
+    """Parquet con un row group por bloque (o cada `row_group_size` filas)"""
+    extension = 'parquet'
+    codecs = ('none', 'gzip', 'snappy', 'zstd', 'lz4')
+
+    @classmethod
+    def supports_level(cls, codec):
+        return codec != 'none' and pa.Codec.supports_compression_level(codec)
+
+    def _open(self, schema):
+        level = self.level if self.supports_level(self.codec) else None
+        return pq.ParquetWriter(self.path, schema, compression=self.codec,
+                                compression_level=level,
+                                use_dictionary=self.dictionary)
+
+    def _write_table(self, table):
+        self.writer.write_table(table, row_group_size=self.row_group_size or max(len(table), 1))
+
+    @staticmethod
+    def read(path, codec='none'):
+        return pq.read_table(path).to_pandas()
+
+class FeatherWriter(ArrowWriter):
+    """Feather v2 (archivo Arrow IPC). Solo admite lz4 o zstd y no usa
+    diccionarios, que en un archivo IPC no pueden cambiar entre bloques"""
+    extension = 'arrow'
+    codecs = ('none', 'zstd', 'lz4')
+
+    @classmethod
+    def supports_level(cls, codec):
+        return codec != 'none'
+
+    def _open(self, schema):
+        compression = None
+        if self.codec != 'none':
+            compression = pa.Codec('lz4_frame' if self.codec == 'lz4' else self.codec, self.level)
+        self.sink = pa.OSFile(self.path, 'wb')
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        return pa.ipc.new_file(self.sink, schema, options=options)
+
+    def _write_table(self, table):
+        self.writer.write_table(table, max_chunksize=self.row_group_size)
+
+    def _close(self):
+        if self.writer is None:
+            # Sin bloques: archivo Arrow válido sin columnas
+            with pa.OSFile(self.path, 'wb') as sink:
+                pa.ipc.new_file(sink, pa.schema([])).close()
+            return
+        self.writer.close()
+        self.sink.close()
+
+    @staticmethod
+    def read(path, codec='none'):
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+class ORCWriter(ArrowWriter):
+    """ORC; gzip se escribe como zlib (mismo algoritmo) y `row_group_size`
+    es la cantidad de filas por entrada del índice. pyarrow no permite elegir
+    el nivel de compresión de ORC: `level` se ignora"""
+    extension = 'orc'
+    codecs = ('none', 'gzip', 'snappy', 'zstd', 'lz4')
+
+    def _open(self, schema):
+        from pyarrow import orc
+        compression = {'none': 'uncompressed', 'gzip': 'zlib'}.get(self.codec, self.codec)
+        return orc.ORCWriter(self.path, compression=compression,
+                             row_index_stride=self.row_group_size or 10000,
+                             dictionary_key_size_threshold=1.0 if self.dictionary else 0.0)
+
+    def _write_table(self, table):
+        self.writer.write(table)
+
+    @staticmethod
+    def read(path, codec='none'):
+        from pyarrow import orc
+        return orc.read_table(path).to_pandas()
+
+# Codec de fastavro para cada codec de la exportación; snappy y zstandard
+# necesitan paquetes aparte (ver requirements.txt)
+AVRO_CODECS = {'none': 'null', 'gzip': 'deflate', 'snappy': 'snappy', 'zstd': 'zstandard'}
+AVRO_CODEC_PACKAGES = {'snappy': 'cramjam', 'zstd': 'zstandard'}
+
+def avro_field_type(series):
+    """Tipo Avro de una columna según su dtype (fechas con tipos lógicos)"""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        avro_type = 'boolean'
+    elif pd.api.types.is_integer_dtype(dtype):
+        avro_type = 'long' if dtype.itemsize > 4 else 'int'
+    elif pd.api.types.is_float_dtype(dtype):
+        avro_type = 'double'
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        avro_type = {'type': 'long', 'logicalType': 'timestamp-millis'}
+    else:
+        inferred = pd.api.types.infer_dtype(series, skipna=True)
+        if inferred == 'date':
+            avro_type = {'type': 'int', 'logicalType': 'date'}
+        elif inferred == 'datetime':
+            avro_type = {'type': 'long', 'logicalType': 'timestamp-millis'}
+        else:
+            avro_type = 'string'
+    if series.isna().any():
+        return ['null', avro_type]
+    return avro_type
+
+def avro_schema(df, name='Venta'):
+    """Schema Avro derivado de los dtypes del DataFrame"""
+    return {
+        'type': 'record',
+        'name': name,
+        'fields': [{'name': str(column), 'type': avro_field_type(df[column])}
+                   for column in df.columns]
+    }
+
+def avro_column_values(series, avro_type):
+    """Convierte una columna completa a valores Avro (fechas como enteros)"""
+    if isinstance(avro_type, list):
+        avro_type = avro_type[1]
+    logical = avro_type.get('logicalType') if isinstance(avro_type, dict) else None
+    mask = series.isna().to_numpy()
+    if logical is None and avro_type != 'string':
+        if not mask.any():
+            return series.tolist()
+        # Nulos de columnas numéricas (NaN, pd.NA) como None
+        values = series.astype(object).to_numpy()
+        values[mask] = None
+        return values.tolist()
+
+    if logical == 'date':
+        values = pd.to_datetime(series).to_numpy().astype('datetime64[D]').astype('int64')
+    elif logical == 'timestamp-millis':
+        values = pd.to_datetime(series).to_numpy().astype('datetime64[ms]').astype('int64')
+    else:
+        values = series.astype(str).to_numpy()
+    values = values.astype(object)
+    values[mask] = None
+    return values.tolist()
+
+def iter_avro_records(df, schema, block_rows=10000):
+    """Genera los registros de a bloques, convirtiendo cada bloque por columnas"""
+    names = [field['name'] for field in schema['fields']]
+    types = [field['type'] for field in schema['fields']]
+    for start in range(0, len(df), block_rows):
+        block = df.iloc[start:start + block_rows]
+        columns = [avro_column_values(block[name], avro_type)
+                   for name, avro_type in zip(names, types)]
+        yield [dict(zip(names, row)) for row in zip(*columns)]
+
+class AvroWriter(ChunkWriter):
+    """Avro por bloques con el schema derivado del primer bloque; gzip se
+    escribe como deflate"""
+    extension = 'avro'
+    codecs = tuple(AVRO_CODECS)
+
+    @classmethod
+    def supports_level(cls, codec):
+        return codec in ('gzip', 'zstd')
+
+    def __init__(self, path, **options):
+        super().__init__(path, **options)
+        self.file = open(path, 'wb')
+        self.writer = None
+        self.schema = None
+
+    def _open(self, schema):
+        import fastavro
+        package = AVRO_CODEC_PACKAGES.get(self.codec)
+        if package is not None and importlib.util.find_spec(package) is None:
+            raise ValueError(f"El codec {self.codec} de Avro necesita el paquete {package}")
+        self.schema = fastavro.parse_schema(schema)
+        self.writer = fastavro.write.Writer(self.file, self.schema,
+                                            codec=AVRO_CODECS[self.codec],
+                                            compression_level=self.level
+                                            if self.supports_level(self.codec) else None,
+                                            sync_interval=2 ** 62)
+
+    def _write(self, df):
+        if self.writer is None:
+            self._open(avro_schema(df))
+        for records in iter_avro_records(df, self.schema, self.row_group_size or 10000):
+            for record in records:
+                self.writer.write(record)
+            self.writer.flush()
+
+    def _close(self):
+        try:
+            if self.writer is None:
+                # Sin bloques: archivo Avro válido (cabecera y schema) sin columnas
+                self._open(avro_schema(pd.DataFrame()))
+                self.writer.flush()
+        finally:
+            self.file.close()
+
+    @staticmethod
+    def read(path, codec='none'):
+        import fastavro
+        with open(path, 'rb') as f:
+            return pd.DataFrame(list(fastavro.reader(f)))
+
+# Registro de exportadores por nombre de formato
+EXPORTERS = {
+    'CSV': CSVWriter,
+    'TXT': TXTWriter,
+    'JSON': JSONWriter,
+    'PARQUET': ParquetWriter,
+    'FEATHER': FeatherWriter,
+    'ORC': ORCWriter,
+    'AVRO': AvroWriter
+}
+
+def register_exporter(name, writer_class):
+    """Agrega (o reemplaza) un formato de exportación"""
+    EXPORTERS[name.upper()] = writer_class
+
+def get_exporter(format_type):
+    try:
+        return EXPORTERS[format_type.upper()]
+    except KeyError:
+        raise ValueError(f"Formato no soportado: {format_type}") from None
+
+def export_filename(format_type, base_name, codec='none'):
+    """Nombre de archivo del formato; los de texto comprimidos llevan sufijo"""
+    exporter = get_exporter(format_type)
+    text = issubclass(exporter, (CSVWriter, JSONWriter))
+    return f"{base_name}.{exporter.extension}{TEXT_SUFFIXES.get(codec, '') if text else ''}"
+
+def open_writer(format_type, path, **options):
+    """Crea el escritor incremental del formato indicado con sus opciones"""
+    return get_exporter(format_type)(path, **options)
+
+def export_dataframe(format_type, df, path, **options):
+    """Escribe `df` completo en `path` con el escritor del formato.
+
+    Devuelve (tiempo, tamaño); si la escritura falla lanza el error.
+    """
+    start = time.time()
+    writer = open_writer(format_type, path, **options)
+    writer.write(df)
+    if writer.close()[0] is None:
+        raise writer.error
+    return time.time() - start, os.path.getsize(path)
+
+def benchmark_matrix(df, output_dir, formats=None, codecs=None, level=None,
+                     row_group_size=None, dictionary=True, base_name='ventas'):
+    """Escribe y vuelve a leer `df` en cada combinación formato × codec.
+
+    Devuelve un DataFrame con tiempo de escritura, tiempo de lectura y bytes
+    por combinación; las que el formato no soporta se omiten.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    memory_mb = df.memory_usage(deep=True).sum() / 1e6
+    results = []
+    for format_type in formats or list(EXPORTERS):
+        exporter = get_exporter(format_type)
+        for codec in codecs or CODECS:
+            if codec not in exporter.codecs:
+                continue
+            name = export_filename(format_type, f"{base_name}_{format_type.lower()}_{codec}", codec)
+            # 'level_applied' queda en False si el formato/codec ignora el nivel
+            row = {'format': format_type.upper(), 'codec': codec, 'level': level,
+                   'level_applied': level is not None and exporter.supports_level(codec),
+                   'row_group_size': row_group_size, 'dictionary': dictionary, 'rows': len(df)}
+            try:
+                writer = open_writer(format_type, os.path.join(output_dir, name), codec=codec,
+                                     level=level, row_group_size=row_group_size,
+                                     dictionary=dictionary)
+            except Exception as e:
+                print(f"Error exportando {format_type} ({codec}): {str(e)}")
+                results.append({**row, 'error': str(e)})
+                continue
+            writer.write(df)
+            path, size, write_time = writer.close()
+            if path is None:
+                results.append({**row, 'error': str(writer.error)})
+                continue
+
+            start = time.perf_counter()
+            try:
+                read_rows = len(exporter.read(path, codec))
+            except Exception as e:
+                print(f"Error leyendo {path}: {str(e)}")
+                results.append({**row, 'write_time': write_time, 'bytes': size, 'error': str(e)})
+                continue
+            read_time = time.perf_counter() - start
+
+            results.append({**row, 'write_time': write_time, 'read_time': read_time,
+                            'bytes': size, 'read_rows': read_rows,
+                            'write_mb_s': memory_mb / write_time if write_time else None,
+                            'read_mb_s': memory_mb / read_time if read_time else None})
+    return pd.DataFrame(results)
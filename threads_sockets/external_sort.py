@@ -0,0 +1,159 @@
+import os
+import heapq
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from index_sorts import sort_keys, comparable_keys, merge_order
+
+# Ordenamiento externo: los chunks se acumulan hasta llenar el presupuesto de
+# memoria, cada corrida se ordena y se escribe a disco como archivo Arrow IPC,
+# y al final se mezclan todas las corridas leyendo un lote a la vez de cada una.
+
+KEY_COLUMN = '__sort_key'
+
+def _write_run(frames, column, order_fn, path, batch_rows):
+    df = pd.concat(frames, ignore_index=True)
+    keys = sort_keys(df, column)
+    order = order_fn(keys)
+    keys = comparable_keys(df, column, keys)
+    table = pa.Table.from_pandas(df.take(order), preserve_index=False)
+    table = table.append_column(KEY_COLUMN, pa.array(keys[order]))
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=batch_rows)
+    return len(df)
+
+def _split_chunk(chunk, run_budget):
+    """Divide un chunk más grande que el presupuesto de una corrida en partes
+    que entran en él; devuelve [(parte, bytes)]"""
+    size = int(chunk.memory_usage(deep=True).sum())
+    if size <= run_budget:
+        return [(chunk, size)]
+    rows = max(len(chunk) * run_budget // size, 1)
+    pieces = [chunk.iloc[start:start + rows] for start in range(0, len(chunk), rows)]
+    return [(piece, int(piece.memory_usage(deep=True).sum())) for piece in pieces]
+
+class _RunCursor:
+    """Lee una corrida ordenada lote a lote desde un archivo mapeado en memoria"""
+    def __init__(self, path):
+        self.source = pa.memory_map(path)
+        self.reader = pa.ipc.open_file(self.source)
+        self.next_batch = 0
+        self.batch = None
+        self.keys = None
+        self.offset = 0
+
+    def load_next(self):
+        """Carga el siguiente lote no vacío; devuelve False si la corrida terminó"""
+        while self.next_batch < self.reader.num_record_batches:
+            self.batch = self.reader.get_batch(self.next_batch)
+            self.next_batch += 1
+            if self.batch.num_rows:
+                self.keys = self.batch.column(KEY_COLUMN).to_numpy(zero_copy_only=False)
+                self.offset = 0
+                return True
+        self.batch = None
+        return False
+
+    def exhausted(self):
+        return self.offset >= len(self.keys)
+
+    def take_until(self, bound):
+        """Devuelve las filas pendientes con clave <= bound"""
+        end = self.offset + int(np.searchsorted(self.keys[self.offset:], bound, side='right'))
+        piece = self.batch.slice(self.offset, end - self.offset)
+        self.offset = end
+        return piece
+
+    def close(self):
+        self.source.close()
+
+def _open_writer(output_path, schema):
+    if output_path.endswith('.parquet'):
+        return pq.ParquetWriter(output_path, schema)
+    return pa.ipc.new_file(output_path, schema)
+
+def _merge_runs(paths, output_path):
+    cursors = [_RunCursor(path) for path in paths]
+    heap = []
+    for i, cursor in enumerate(cursors):
+        if cursor.load_next():
+            heap.append((cursor.keys[-1], i))
+    heapq.heapify(heap)
+
+    schema = cursors[0].reader.schema
+    schema = schema.remove(schema.get_field_index(KEY_COLUMN))
+    writer = _open_writer(output_path, schema)
+    rows = 0
+    try:
+        while heap:
+            # La menor "última clave" entre los lotes cargados es una cota
+            # segura: nada pendiente en ninguna corrida puede ser menor
+            bound = heap[0][0]
+            pieces = [cursor.take_until(bound) for cursor in cursors
+                      if cursor.batch is not None]
+            merged = pa.Table.from_batches([p for p in pieces if p.num_rows])
+            keys = merged.column(KEY_COLUMN).to_numpy()
+            merged = merged.take(pa.array(np.argsort(keys, kind='stable')))
+            writer.write_table(merged.drop_columns([KEY_COLUMN]))
+            rows += merged.num_rows
+
+            # Recargar las corridas cuyo lote se agotó (están en la cima del heap)
+            while heap and cursors[heap[0][1]].exhausted():
+                _, i = heapq.heappop(heap)
+                if cursors[i].load_next():
+                    heapq.heappush(heap, (cursors[i].keys[-1], i))
+    finally:
+        writer.close()
+        for cursor in cursors:
+            cursor.close()
+    return rows
+
+def external_sort(chunks, output_path, column='FECHA_VENTA', memory_budget=256 * 1024 ** 2,
+                  temp_dir=None, batch_rows=65536, order_fn=merge_order):
+    """Ordena un flujo de DataFrames más grande que la memoria disponible.
+
+    `chunks` es cualquier iterable de DataFrames (o RecordBatch de Arrow) con
+    las mismas columnas. Los chunks más grandes que el presupuesto de una
+    corrida se dividen, pero cada uno se recibe entero: conviene leerlos de
+    un tamaño menor que `memory_budget` / 2.
+    Las corridas intermedias se guardan en un directorio temporal dentro de
+    `temp_dir` y se borran al terminar. La salida es Parquet si `output_path`
+    termina en .parquet y Arrow IPC en otro caso.
+    """
+    # La mitad del presupuesto para acumular datos y la otra para ordenarlos
+    run_budget = max(memory_budget // 2, 1)
+    work_dir = tempfile.mkdtemp(prefix='external_sort_', dir=temp_dir)
+    paths = []
+    try:
+        frames, buffered = [], 0
+        for chunk in chunks:
+            if isinstance(chunk, (pa.RecordBatch, pa.Table)):
+                chunk = chunk.to_pandas()
+            if not len(chunk):
+                continue
+            # Ninguna corrida supera el presupuesto, aunque los chunks sean más grandes
+            for piece, size in _split_chunk(chunk, run_budget):
+                if frames and buffered + size > run_budget:
+                    paths.append(os.path.join(work_dir, f"run_{len(paths):05d}.arrow"))
+                    _write_run(frames, column, order_fn, paths[-1], batch_rows)
+                    frames, buffered = [], 0
+                frames.append(piece)
+                buffered += size
+            del chunk
+        if frames:
+            paths.append(os.path.join(work_dir, f"run_{len(paths):05d}.arrow"))
+            _write_run(frames, column, order_fn, paths[-1], batch_rows)
+        del frames
+
+        if not paths:
+            print("No hay datos para ordenar")
+            return {'rows': 0, 'runs': 0, 'output_path': None}
+
+        rows = _merge_runs(paths, output_path)
+        return {'rows': rows, 'runs': len(paths), 'output_path': output_path}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
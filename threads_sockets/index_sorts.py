@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+# Implementaciones de los algoritmos sobre un arreglo NumPy de claves.
+# Cada función devuelve la permutación que ordena las claves; el DataFrame
+# se materializa una sola vez al final con df.take(permutación).
+
+RUN_SIZE = 32  # tamaño de los bloques iniciales de merge sort
+
+def sort_keys(df, column='FECHA_VENTA'):
+    """Convierte la columna de ordenamiento en un arreglo NumPy comparable.
+
+    Fechas (incluidos objetos datetime.date y fechas con zona horaria) se
+    pasan a enteros; cualquier otro objeto no numérico se reemplaza por su
+    rango. Los nulos van al final.
+    """
+    values = df[column]
+    if values.dtype == object:
+        if pd.api.types.infer_dtype(values, skipna=True) in ('date', 'datetime'):
+            values = pd.to_datetime(values)
+        else:
+            codes, _ = pd.factorize(values, sort=True)
+            return np.where(codes < 0, np.iinfo(np.int64).max, codes).astype(np.int64)
+
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        # Con zona horaria to_numpy() devuelve objetos Timestamp; en UTC el
+        # orden de los instantes es el mismo
+        values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        keys = values.to_numpy().view(np.int64).copy()
+        keys[values.isna().to_numpy()] = np.iinfo(np.int64).max
+        return keys
+
+    keys = values.to_numpy()
+    if keys.dtype.kind == 'f':
+        keys = np.where(np.isnan(keys), np.inf, keys)
+    elif keys.dtype.kind == 'b':
+        keys = keys.astype(np.int8)
+    return keys
+
+# Mayor que cualquier texto: los nulos de una columna de texto van al final
+NULL_TEXT = '\U0010ffff'
+
+def comparable_keys(df, column='FECHA_VENTA', keys=None):
+    """Claves que se pueden comparar entre DataFrames distintos (corridas del
+    ordenamiento externo, partes del snapshot).
+
+    Para texto, sort_keys devuelve el rango de cada valor dentro de ese
+    DataFrame, que no se puede comparar con el de otro; en ese caso la clave
+    es el texto mismo. Las demás claves (fechas, números) ya son globales.
+    `keys` evita recalcular sort_keys si ya se tiene.
+    """
+    values = df[column]
+    if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) not in ('date', 'datetime'):
+        return values.where(values.notna(), NULL_TEXT).astype(str).to_numpy(dtype=object)
+    return keys if keys is not None else sort_keys(df, column)
+
+def _swap(arr, idx):
+    tmp = arr[idx]
+    arr[idx] = arr[idx + 1]
+    arr[idx + 1] = tmp
+
+def bubble_order(keys):
+    """Bubble Sort en su variante par-impar: cada pasada compara e intercambia
+    todos los pares vecinos (pares y luego impares) a la vez. Es estable y
+    termina en cuanto una pasada completa no intercambia nada."""
+    keys = np.array(keys, copy=True)
+    n = len(keys)
+    order = np.arange(n)
+    for _ in range(n):
+        swapped = False
+        for start in (0, 1):
+            idx = np.flatnonzero(keys[start:n - 1:2] > keys[start + 1:n:2]) * 2 + start
+            if len(idx):
+                _swap(keys, idx)
+                _swap(order, idx)
+                swapped = True
+        if not swapped:
+            break
+    return order
+
+def _bubble_blocks(keys, order, width):
+    """Ordena in situ bloques consecutivos de `width` elementos con bubble par-impar"""
+    full = len(keys) // width * width
+    if full:
+        k = keys[:full].reshape(-1, width)
+        o = order[:full].reshape(-1, width)
+        for _ in range(width):
+            swapped = False
+            for start in (0, 1):
+                left = k[:, start:width - 1:2]
+                right = k[:, start + 1:width:2]
+                mask = left > right
+                if mask.any():
+                    for arr in (k, o):
+                        a = arr[:, start:width - 1:2]
+                        b = arr[:, start + 1:width:2]
+                        a_new = np.where(mask, b, a)
+                        arr[:, start + 1:width:2] = np.where(mask, a, b)
+                        arr[:, start:width - 1:2] = a_new
+                    swapped = True
+            if not swapped:
+                break
+    if full < len(keys):
+        tail = bubble_order(keys[full:])
+        keys[full:] = keys[full:][tail]
+        order[full:] = order[full:][tail]
+
+def merge_order(keys):
+    """Merge Sort de abajo hacia arriba: bloques iniciales de RUN_SIZE ordenados
+    con bubble par-impar y luego mezclas estables de pares de corridas, cada
+    una resuelta con búsquedas binarias sobre la corrida vecina."""
+    keys = np.array(keys, copy=True)
+    n = len(keys)
+    order = np.arange(n)
+    _bubble_blocks(keys, order, RUN_SIZE)
+
+    out_keys = np.empty_like(keys)
+    out_order = np.empty_like(order)
+    width = RUN_SIZE
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            left, right = keys[lo:mid], keys[mid:hi]
+            # Posición final de cada elemento dentro de la mezcla; en empates
+            # los de la izquierda van primero (estable)
+            pos_left = lo + np.arange(len(left)) + np.searchsorted(right, left, side='left')
+            pos_right = lo + np.arange(len(right)) + np.searchsorted(left, right, side='right')
+            out_keys[pos_left] = left
+            out_keys[pos_right] = right
+            out_order[pos_left] = order[lo:mid]
+            out_order[pos_right] = order[mid:hi]
+        keys, out_keys = out_keys, keys
+        order, out_order = out_order, order
+        width *= 2
+    return order
+
+def quick_order(keys):
+    """Quick Sort con partición en tres (menores, iguales, mayores) usando el
+    elemento central como pivote. Todos los segmentos pendientes de un mismo
+    nivel se particionan a la vez; la partición conserva el orden relativo."""
+    keys = np.array(keys, copy=True)
+    n = len(keys)
+    order = np.arange(n)
+    starts = np.array([0])
+    ends = np.array([n])
+
+    while True:
+        keep = ends - starts > 1
+        starts, ends = starts[keep], ends[keep]
+        if not len(starts):
+            break
+
+        lengths = ends - starts
+        seg = np.repeat(np.arange(len(starts)), lengths)
+        first = np.cumsum(lengths) - lengths
+        pos = np.arange(lengths.sum()) - first[seg] + starts[seg]
+
+        vals = keys[pos]
+        pivots = keys[starts + lengths // 2]
+        cls = (vals >= pivots[seg]).astype(np.int64) + (vals > pivots[seg])
+
+        counts = np.bincount(seg * 3 + cls, minlength=3 * len(starts)).reshape(-1, 3)
+        offsets = np.cumsum(counts, axis=1) - counts
+
+        # Rango de cada elemento dentro de su (segmento, clase), en orden original
+        rank = np.empty(len(pos), dtype=np.int64)
+        for c in range(3):
+            mask = cls == c
+            running = np.cumsum(mask)
+            before = np.concatenate(([0], running))[first]
+            rank[mask] = (running - 1 - before[seg])[mask]
+
+        new_pos = starts[seg] + offsets[seg, cls] + rank
+        moved = order[pos]
+        keys[new_pos] = vals
+        order[new_pos] = moved
+
+        lt_end = starts + counts[:, 0]
+        gt_start = lt_end + counts[:, 1]
+        starts = np.concatenate((starts, gt_start))
+        ends = np.concatenate((lt_end, ends))
+    return order
+
+def heap_order(keys):
+    """Heap Sort sobre las claves (implementación de NumPy)"""
+    return np.argsort(keys, kind='heapsort')
+
+def sort_by(df, order_fn, column='FECHA_VENTA'):
+    """Aplica un algoritmo sobre las claves y reordena las filas una sola vez"""
+    if len(df) <= 1:
+        return df.copy()
+    return df.take(order_fn(sort_keys(df, column)))
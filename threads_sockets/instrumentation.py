@@ -0,0 +1,133 @@
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+# Medición opcional de memoria de las etapas de ordenamiento y exportación.
+# Por cada bloque medido se registra:
+#   rss_peak   pico de la suma de memoria residente del proceso y de sus
+#              procesos hijos (bytes), muestreado con psutil en un hilo aparte;
+#              incluye los buffers de NumPy y Arrow y los workers de los pools
+#              de procesos (p. ej. sample sort). Las páginas compartidas, como
+#              la memoria compartida con los workers, se cuentan en cada
+#              proceso que las usa, y los workers ociosos suman su memoria base
+#   py_peak    pico de memoria reservada por Python/NumPy durante el bloque
+#              por encima de la que ya estaba en uso al empezar (tracemalloc)
+#   py_blocks  bloques reservados en el bloque que siguen vivos al terminar
+#              (tracemalloc solo sigue los bloques vivos, no las liberaciones)
+#
+# py_peak y py_blocks solo miden el proceso principal: lo que reservan los
+# procesos hijos no aparece ahí, solo en rss_peak.
+#
+# tracemalloc hace varias veces más lento el código medido: los tiempos
+# tomados con la medición activa no son comparables con los de una corrida sin
+# ella. Como tracemalloc es global, los bloques medidos de hilos distintos se
+# serializan; dentro de un mismo hilo se pueden anidar (p. ej. el benchmark
+# midiendo una exportación que también se mide).
+
+MEMORY_FIELDS = ['rss_peak', 'py_peak', 'py_blocks']
+
+_lock = threading.RLock()
+# Picos de tracemalloc de los bloques abiertos (del más externo al más interno).
+# Cada bloque reinicia el pico de tracemalloc; antes se guarda en los externos
+_open_peaks = []
+
+def _save_peak():
+    _, peak = tracemalloc.get_traced_memory()
+    for i, saved in enumerate(_open_peaks):
+        _open_peaks[i] = max(saved, peak)
+
+class RSSSampler(threading.Thread):
+    """Registra el máximo RSS del proceso y sus hijos cada `interval` segundos.
+
+    La lista de hijos se vuelve a pedir cada `refresh_every` muestras: recorrer
+    el árbol de procesos en cada muestra pesa sobre lo que se está midiendo.
+    """
+    def __init__(self, interval=0.01, refresh_every=10):
+        super().__init__(daemon=True)
+        import psutil
+        self.psutil = psutil
+        self.process = psutil.Process()
+        self.interval = interval
+        self.refresh_every = refresh_every
+        self.samples = 0
+        self.children = []
+        self.peak = self.rss()
+        self._stop_event = threading.Event()
+
+    def rss(self):
+        if self.samples % self.refresh_every == 0:
+            self.children = self.process.children(recursive=True)
+        self.samples += 1
+        total = self.process.memory_info().rss
+        for child in self.children:
+            try:
+                total += child.memory_info().rss
+            except (self.psutil.NoSuchProcess, self.psutil.AccessDenied):
+                # El hijo terminó después de pedir la lista
+                pass
+        return total
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, self.rss())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, self.rss())
+        return self.peak
+
+class MemoryStats:
+    """Máximos de varios bloques medidos (p. ej. todas las escrituras de un formato)"""
+    def __init__(self):
+        self.rss_peak = None
+        self.py_peak = None
+        self.py_blocks = None
+
+    def update(self, rss_peak, py_peak, py_blocks):
+        self.rss_peak = rss_peak if self.rss_peak is None else max(self.rss_peak, rss_peak)
+        self.py_peak = py_peak if self.py_peak is None else max(self.py_peak, py_peak)
+        self.py_blocks = py_blocks if self.py_blocks is None else max(self.py_blocks, py_blocks)
+
+    def merge(self, other):
+        if other.rss_peak is not None:
+            self.update(other.rss_peak, other.py_peak, other.py_blocks)
+
+    def as_dict(self, prefix=''):
+        return {prefix + field: getattr(self, field) for field in MEMORY_FIELDS}
+
+def _live_blocks():
+    return sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+
+@contextmanager
+def track_memory(stats=None, enabled=True):
+    """Mide la memoria del bloque y la acumula en `stats` (o en un MemoryStats
+    nuevo), que es lo que devuelve el `with`. Con enabled=False no mide nada y
+    los campos quedan en None."""
+    stats = stats if stats is not None else MemoryStats()
+    if not enabled:
+        yield stats
+        return
+
+    with _lock:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        blocks_before = _live_blocks()
+        current_before, _ = tracemalloc.get_traced_memory()
+        _save_peak()
+        tracemalloc.reset_peak()
+        _open_peaks.append(0)
+        sampler = RSSSampler()
+        sampler.start()
+        try:
+            yield stats
+        finally:
+            rss_peak = sampler.stop()
+            _save_peak()
+            peak = _open_peaks.pop()
+            blocks_after = _live_blocks()
+            if started:
+                tracemalloc.stop()
+            stats.update(rss_peak, max(peak - current_before, 0),
+                         max(blocks_after - blocks_before, 0))
@@ -0,0 +1,150 @@
+import time
+import threading
+from contextlib import contextmanager
+
+# Métricas Prometheus del servidor de ordenamiento. Cada petición se divide
+# en fases y la duración de cada una se acumula en un histograma por fase y
+# algoritmo:
+#   accept_wait  desde accept() hasta que un hilo empieza a atender la
+#                conexión (solo en la primera petición de cada conexión)
+#   recv         desde el primer byte recibido hasta el mensaje completo
+#   decode       Arrow IPC -> DataFrame
+#   sort         ordenamiento (con ProcessSortBackend incluye decode/encode
+#                en el proceso hijo y las copias por memoria compartida)
+#   encode       DataFrame -> Arrow IPC
+#   send         envío de la respuesta
+#
+# Las métricas están desactivadas hasta llamar a start_metrics_server(); sin
+# ellas las fases se miden pero no se publican. prometheus_client se importa
+# recién ahí.
+#
+# Con la caché de resultados activa, watch_cache() publica además sus
+# aciertos, fallos y desalojos (sort_server_cache_*), leídos de
+# ResultCache.stats() en cada lectura de /metrics.
+
+_metrics = None
+_current = threading.local()
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+           1.0, 2.5, 5.0, 10.0, 30.0)
+
+class ServerMetrics:
+    def __init__(self):
+        from prometheus_client import Histogram, Gauge
+        self.phase_seconds = Histogram(
+            'sort_server_phase_seconds', 'Duración de cada fase de una petición',
+            ['phase', 'algorithm'], buckets=BUCKETS)
+        self.request_seconds = Histogram(
+            'sort_server_request_seconds', 'Latencia de la petición desde el primer byte '
+            'recibido hasta el fin del envío', ['algorithm', 'status'], buckets=BUCKETS)
+        self.in_flight = Gauge('sort_server_requests_in_flight',
+                               'Peticiones recibidas que todavía no se respondieron')
+        self.connections = Gauge('sort_server_open_connections', 'Conexiones abiertas')
+        self.active_threads = Gauge('sort_server_active_threads', 'Hilos vivos del proceso')
+        self.active_threads.set_function(threading.active_count)
+
+def start_metrics_server(port, host='0.0.0.0'):
+    """Activa las métricas y las publica en http://host:port/metrics"""
+    global _metrics
+    from prometheus_client import start_http_server
+    if _metrics is None:
+        _metrics = ServerMetrics()
+    start_http_server(port, host)
+    print(f"Métricas en http://{host}:{port}/metrics")
+    return _metrics
+
+class RequestSpans:
+    """Duraciones de las fases de una petición"""
+    def __init__(self, accept_wait=None):
+        self.durations = {}
+        if accept_wait is not None:
+            self.durations['accept_wait'] = accept_wait
+        self.started = None
+
+    def begin(self):
+        """Llegó el primer byte de la petición: empieza la fase recv"""
+        self.started = time.perf_counter()
+
+    def received(self):
+        """Petición completa: termina recv y la petición pasa a estar en curso"""
+        self.durations['recv'] = time.perf_counter() - self.started
+        if _metrics is not None:
+            _metrics.in_flight.inc()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def active(self):
+        """Hace que phase() en este hilo registre en esta petición"""
+        previous = getattr(_current, 'spans', None)
+        _current.spans = self
+        try:
+            yield self
+        finally:
+            _current.spans = previous
+
+    def finish(self, algorithm, status):
+        """Vuelca las fases a los histogramas; se llama una vez por cada
+        petición recibida, aunque la respuesta haya fallado"""
+        if _metrics is None:
+            return
+        for name, seconds in self.durations.items():
+            _metrics.phase_seconds.labels(name, algorithm).observe(seconds)
+        if self.started is not None:
+            _metrics.request_seconds.labels(algorithm, status).observe(
+                time.perf_counter() - self.started)
+            _metrics.in_flight.dec()
+
+class CacheCollector:
+    """Collector de prometheus_client con los contadores de una ResultCache"""
+    def __init__(self, cache):
+        self.cache = cache
+
+    def collect(self):
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+        stats = self.cache.stats()
+        yield CounterMetricFamily('sort_server_cache_hits', 'Respuestas servidas desde la caché',
+                                  value=stats['hits'])
+        yield CounterMetricFamily('sort_server_cache_misses',
+                                  'Peticiones que no estaban en la caché', value=stats['misses'])
+        yield CounterMetricFamily('sort_server_cache_evictions', 'Entradas desalojadas (LRU)',
+                                  value=stats['evictions'])
+        yield GaugeMetricFamily('sort_server_cache_entries', 'Entradas en la caché',
+                                value=stats['entries'])
+        yield GaugeMetricFamily('sort_server_cache_bytes', 'Bytes ocupados por la caché',
+                                value=stats['bytes'])
+
+def watch_cache(cache):
+    """Publica los contadores de `cache` si las métricas están activas"""
+    if _metrics is None:
+        return
+    from prometheus_client import REGISTRY
+    REGISTRY.register(CacheCollector(cache))
+
+@contextmanager
+def phase(name):
+    """Mide la fase `name` de la petición activa en este hilo (si hay una)"""
+    spans = getattr(_current, 'spans', None)
+    if spans is None:
+        yield
+        return
+    with spans.phase(name):
+        yield
+
+@contextmanager
+def connection():
+    """Cuenta una conexión abierta mientras dura el bloque"""
+    if _metrics is None:
+        yield
+        return
+    _metrics.connections.inc()
+    try:
+        yield
+    finally:
+        _metrics.connections.dec()
@@ -0,0 +1,109 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory, resource_tracker
+from protocol import decode_dataframe, encode_dataframe
+from threading_ed2 import ALGORITHMS
+from metrics import phase
+
+def _ping(_):
+    """Tarea vacía: enviar una por proceso hace que el pool los arranque todos"""
+    return os.getpid()
+
+def _sort_shared(in_name, in_size, algorithm, column):
+    """Ordena el DataFrame Arrow guardado en memoria compartida.
+
+    Devuelve (nombre, tamaño) del segmento con el resultado y el tiempo de
+    ordenamiento. El proceso padre es quien libera ambos segmentos.
+    """
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    try:
+        df = decode_dataframe(shm_in.buf[:in_size])
+        result, time_taken = ALGORITHMS[algorithm](df, column)
+        # Liberar las vistas sobre el segmento antes de cerrarlo
+        del df
+        body = encode_dataframe(result)
+        del result
+    finally:
+        try:
+            shm_in.close()
+        except BufferError:
+            pass
+
+    shm_out = shared_memory.SharedMemory(create=True, size=max(body.size, 1))
+    try:
+        shm_out.buf[:body.size] = memoryview(body).cast('B')
+    except Exception:
+        shm_out.close()
+        shm_out.unlink()
+        raise
+    shm_out.close()
+    return shm_out.name, body.size, time_taken
+
+class ProcessSortBackend:
+    """Ejecuta los ordenamientos en un pool persistente de procesos.
+
+    Los cuerpos Arrow se pasan por memoria compartida en ambas direcciones,
+    de modo que solo viajan por pickle los nombres de los segmentos. Si un
+    proceso muere, la petición en curso falla y el pool se vuelve a crear.
+    """
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count()
+        self.lock = threading.Lock()
+        # Los procesos deben compartir el resource tracker del padre; si cada
+        # uno arranca el suyo, reportan como fugas los segmentos que libera el padre
+        if os.name == 'posix':
+            resource_tracker.ensure_running()
+        self.executor = self._start_executor()
+
+    def _start_executor(self):
+        # Con fork, un proceso creado mientras otro hilo (p. ej. el de las
+        # métricas) tiene tomado un lock lo hereda tomado y se cuelga;
+        # forkserver arranca los procesos desde un servidor sin hilos
+        context = multiprocessing.get_context('forkserver' if os.name == 'posix' else 'spawn')
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        # Arrancar todos los procesos ahora y no con la primera petición; al
+        # arrancar, cada uno importa este módulo y con él pandas y pyarrow
+        list(executor.map(_ping, range(self.max_workers)))
+        return executor
+
+    def _restart(self, broken):
+        """Reemplaza el pool roto (una sola vez aunque fallen varias peticiones)"""
+        with self.lock:
+            if self.executor is broken:
+                print("Un proceso del pool terminó de forma inesperada; se crea un pool nuevo")
+                broken.shutdown(wait=False)
+                self.executor = self._start_executor()
+
+    def sort(self, algorithm, body, column='FECHA_VENTA'):
+        """Ordena un cuerpo Arrow IPC; devuelve (cuerpo ordenado, tiempo)"""
+        # Para las métricas todo cuenta como fase 'sort': decodificar y
+        # codificar ocurren en el proceso hijo
+        with phase('sort'):
+            body = memoryview(body).cast('B')
+            shm_in = shared_memory.SharedMemory(create=True, size=max(body.nbytes, 1))
+            executor = self.executor
+            try:
+                shm_in.buf[:body.nbytes] = body
+                future = executor.submit(_sort_shared, shm_in.name, body.nbytes,
+                                         algorithm, column)
+                out_name, out_size, time_taken = future.result()
+            except BrokenProcessPool:
+                self._restart(executor)
+                raise
+            finally:
+                shm_in.close()
+                shm_in.unlink()
+
+            shm_out = shared_memory.SharedMemory(name=out_name)
+            try:
+                result_body = bytes(shm_out.buf[:out_size])
+            finally:
+                shm_out.close()
+                shm_out.unlink()
+        return result_body, time_taken
+
+    def shutdown(self):
+        self.executor.shutdown()
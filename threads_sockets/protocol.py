@@ -0,0 +1,146 @@
+import asyncio
+import json
+import socket
+import struct
+import pyarrow as pa
+
+# Protocolo binario versionado
+# Cada mensaje es: prefijo fijo + cabecera JSON + cuerpo Arrow IPC
+#   magic (4s) | version (B) | flags (B) | largo cabecera (I) | largo cuerpo (Q)
+MAGIC = b'ED2S'
+VERSION = 1
+PREFIX = struct.Struct('!4sBBIQ')
+MAX_HEADER_SIZE = 1 << 20
+# El cuerpo se recibe en un buffer preasignado: sin tope, un prefijo inválido
+# podría pedir una reserva de cualquier tamaño
+MAX_BODY_SIZE = 1 << 31
+
+class ProtocolError(Exception):
+    """Error en el formato de un mensaje recibido"""
+
+def encode_dataframe(df):
+    """Serializa un DataFrame como stream Arrow IPC (columnar)"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+def decode_dataframe(body):
+    """Reconstruye un DataFrame desde un cuerpo Arrow IPC sin copiar el buffer"""
+    table = pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    return table.to_pandas(split_blocks=True)
+
+def pack_message(header, body=b''):
+    """Arma el prefijo y la cabecera de un mensaje; devuelve (cabecera, cuerpo)"""
+    header_bytes = json.dumps(header).encode()
+    body = memoryview(body)
+    prefix = PREFIX.pack(MAGIC, VERSION, 0, len(header_bytes), body.nbytes)
+    return prefix + header_bytes, body
+
+def send_message(sock, header, df=None):
+    """Envía un mensaje con un DataFrame opcional como cuerpo"""
+    body = encode_dataframe(df) if df is not None else b''
+    send_packed(sock, *pack_message(header, body))
+
+def send_packed(sock, head, body):
+    """Envía un mensaje ya empaquetado sin concatenar el cuerpo"""
+    sock.sendall(head)
+    if body.nbytes:
+        sock.sendall(body)
+
+def recv_into_exactly(sock, view):
+    """Llena por completo el buffer `view` usando recv_into"""
+    received = 0
+    total = view.nbytes
+    while received < total:
+        n = sock.recv_into(view[received:], total - received)
+        if n == 0:
+            raise ConnectionError("Conexión cerrada a mitad de mensaje")
+        received += n
+
+def parse_prefix(prefix):
+    """Valida el prefijo y devuelve (largo cabecera, largo cuerpo)"""
+    magic, version, _flags, header_len, body_len = PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise ProtocolError("Mensaje con identificador desconocido")
+    if version != VERSION:
+        raise ProtocolError(f"Versión de protocolo no soportada: {version}")
+    if header_len > MAX_HEADER_SIZE:
+        raise ProtocolError(f"Cabecera demasiado grande: {header_len} bytes")
+    if body_len > MAX_BODY_SIZE:
+        raise ProtocolError(f"Cuerpo demasiado grande: {body_len} bytes")
+    return header_len, body_len
+
+def recv_message(sock, on_start=None, idle_timeout=None, io_timeout=None):
+    """Recibe un mensaje completo; devuelve (cabecera, cuerpo) o (None, None) si el
+    otro extremo cerró la conexión antes de enviar algo. `on_start` se llama
+    al llegar el primer byte del mensaje.
+
+    Con `idle_timeout` la espera del primer byte (inactividad entre mensajes)
+    tiene ese límite y si vence lanza socket.timeout; el resto del mensaje se
+    recibe con `io_timeout` por cada recv (None: sin límite), así un cliente
+    lento a mitad de mensaje no se corta por inactividad. Sin `idle_timeout`
+    se respeta el timeout que ya tenga el socket.
+    """
+    prefix = bytearray(PREFIX.size)
+    view = memoryview(prefix)
+    if idle_timeout is not None:
+        sock.settimeout(idle_timeout)
+    n = sock.recv_into(view)
+    if n == 0:
+        return None, None
+    if idle_timeout is not None:
+        sock.settimeout(io_timeout)
+    if on_start is not None:
+        on_start()
+    try:
+        recv_into_exactly(sock, view[n:])
+        header_len, body_len = parse_prefix(prefix)
+
+        header_bytes = bytearray(header_len)
+        recv_into_exactly(sock, memoryview(header_bytes))
+        header = json.loads(header_bytes)
+
+        # Buffer preasignado al tamaño exacto del cuerpo
+        body = bytearray(body_len)
+        recv_into_exactly(sock, memoryview(body))
+    except socket.timeout:
+        raise ConnectionError("Tiempo de espera agotado a mitad de mensaje") from None
+    return header, body
+
+def recv_dataframe(sock):
+    """Recibe un mensaje y decodifica su cuerpo como DataFrame"""
+    header, body = recv_message(sock)
+    if header is None:
+        return None, None
+    df = decode_dataframe(body) if body else None
+    return header, df
+
+async def read_message_async(reader, on_start=None, idle_timeout=None):
+    """Versión asyncio de recv_message sobre un StreamReader.
+
+    `idle_timeout` limita solo la espera del prefijo (inactividad entre
+    mensajes); una vez que empieza un mensaje, la cabecera y el cuerpo se
+    reciben sin límite de tiempo para no cortar a clientes lentos. Si vence
+    lanza asyncio.TimeoutError.
+    """
+    try:
+        prefix = await asyncio.wait_for(reader.readexactly(PREFIX.size), idle_timeout)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None, None
+        raise ConnectionError("Conexión cerrada a mitad de mensaje")
+    if on_start is not None:
+        on_start()
+    header_len, body_len = parse_prefix(prefix)
+    header = json.loads(await reader.readexactly(header_len))
+    body = await reader.readexactly(body_len)
+    return header, body
+
+async def write_message_async(writer, head, body):
+    """Escribe un mensaje empaquetado y espera a que se vacíe el buffer"""
+    writer.write(head)
+    if body.nbytes:
+        writer.write(body)
+    await writer.drain()
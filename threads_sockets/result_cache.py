@@ -0,0 +1,79 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+class ResultCache:
+    """Caché de resultados del servidor con desalojo LRU por presupuesto de bytes.
+
+    Envuelve un backend de ordenamiento (LocalSortBackend, ProcessSortBackend)
+    y se usa en su lugar. La clave es un hash del cuerpo Arrow recibido junto
+    con el algoritmo y la columna, así que un acierto devuelve el cuerpo ya
+    codificado sin decodificar el DataFrame ni ordenar.
+    """
+    def __init__(self, backend, max_bytes=256 * 1024 ** 2):
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(algorithm, body, column):
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        return algorithm, column, len(body), digest
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, result_body, time_taken):
+        size = len(result_body)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = (result_body, time_taken)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (evicted, _) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def sort(self, algorithm, body, column='FECHA_VENTA'):
+        result_body, time_taken, _ = self.sort_cached(algorithm, body, column)
+        return result_body, time_taken
+
+    def sort_cached(self, algorithm, body, column='FECHA_VENTA'):
+        """Como sort() pero indica si la respuesta salió de la caché:
+        devuelve (cuerpo, tiempo del ordenamiento original, cached)"""
+        key = self.make_key(algorithm, body, column)
+        entry = self.get(key)
+        if entry is not None:
+            return entry + (True,)
+
+        result_body, time_taken = self.backend.sort(algorithm, body, column)
+        self.put(key, result_body, time_taken)
+        return result_body, time_taken, False
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0
+            }
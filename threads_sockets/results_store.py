@@ -0,0 +1,99 @@
+import os
+import uuid
+import datetime
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# Almacén de resultados de los benchmarks: un dataset Parquet particionado
+# (estilo hive) por run_id/method/format/size al que solo se agregan archivos.
+# Cada fila es una muestra: una iteración de ordenamiento (stage='sort',
+# format='none') o una exportación (stage='export'). Las columnas de memoria
+# (rss_peak, py_peak, py_blocks) quedan vacías si no se midió la memoria.
+#
+# Las lecturas usan pyarrow.dataset: los filtros por claves de partición
+# descartan directorios enteros y solo se leen las columnas pedidas.
+
+PARTITION_KEYS = ['run_id', 'method', 'format', 'size']
+
+PARTITION_SCHEMA = pa.schema([
+    ('run_id', pa.string()),
+    ('method', pa.string()),
+    ('format', pa.string()),
+    ('size', pa.int64())
+])
+
+RESULTS_SCHEMA = pa.schema(list(PARTITION_SCHEMA) + [
+    ('stage', pa.string()),
+    ('codec', pa.string()),
+    ('distribution', pa.string()),
+    ('iteration', pa.int32()),
+    ('seconds', pa.float64()),
+    ('bytes', pa.int64()),
+    ('rss_peak', pa.int64()),
+    ('py_peak', pa.int64()),
+    ('py_blocks', pa.int64()),
+    ('created_at', pa.timestamp('ms', tz='UTC'))
+])
+
+def new_run_id():
+    """Identificador de corrida que se ordena por fecha"""
+    return datetime.datetime.now().strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+
+class ResultsStore:
+    def __init__(self, root='results_store'):
+        self.root = root
+        self.partitioning = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+    def append(self, records):
+        """Agrega muestras (lista de dicts o DataFrame) sin tocar los archivos existentes"""
+        if hasattr(records, 'to_dict'):
+            records = records.to_dict('records')
+        if not records:
+            return 0
+        now = datetime.datetime.now(datetime.timezone.utc)
+        rows = [{'created_at': now, 'format': 'none', **record} for record in records]
+        table = pa.Table.from_pylist(rows, schema=RESULTS_SCHEMA)
+        os.makedirs(self.root, exist_ok=True)
+        ds.write_dataset(table, self.root, format='parquet', partitioning=self.partitioning,
+                         basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                         existing_data_behavior='overwrite_or_ignore')
+        return len(rows)
+
+    def dataset(self):
+        return ds.dataset(self.root, schema=RESULTS_SCHEMA, format='parquet',
+                          partitioning=self.partitioning)
+
+    def run_ids(self):
+        """Corridas guardadas (de la más vieja a la más nueva), sin leer datos"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name.split('=', 1)[1] for name in os.listdir(self.root)
+                      if name.startswith('run_id='))
+
+    @staticmethod
+    def build_filter(**filters):
+        """Filtro de igualdad (valor) o pertenencia (lista) por columna; None se ignora"""
+        expression = None
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                condition = ds.field(column).isin(list(value))
+            else:
+                condition = ds.field(column) == value
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def scan(self, columns=None, **filters):
+        """Tabla Arrow con las columnas y filas pedidas"""
+        if not os.path.isdir(self.root):
+            return RESULTS_SCHEMA.empty_table().select(columns or RESULTS_SCHEMA.names)
+        return self.dataset().to_table(columns=columns, filter=self.build_filter(**filters))
+
+    def aggregate(self, group_by, value='seconds', **filters):
+        """Cantidad, media, mediana aproximada, mínimo, máximo y desvío de `value`
+        agrupados, leyendo solo las columnas necesarias"""
+        table = self.scan(columns=list(group_by) + [value], **filters)
+        functions = ['count', 'mean', 'approximate_median', 'min', 'max', 'stddev']
+        aggregations = [(value, fn) for fn in functions]
+        return table.group_by(list(group_by)).aggregate(aggregations).to_pandas()
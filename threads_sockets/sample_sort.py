@@ -0,0 +1,90 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+
+# Sample sort paralelo: se eligen separadores a partir de una muestra de las
+# claves, cada fila se asigna a un bucket y los buckets se ordenan a la vez en
+# procesos distintos. Claves y resultados viajan por memoria compartida.
+
+MIN_PARALLEL_ROWS = 200000
+OVERSAMPLE = 64
+
+# Un pool por cantidad de procesos pedida, creado la primera vez y nunca
+# cerrado mientras el módulo esté en uso: varios hilos (p. ej. los del
+# servidor) pueden estar ordenando a la vez con el mismo pool
+_executors = {}
+_executors_lock = threading.Lock()
+
+def _get_executor(workers):
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            if os.name == 'posix':
+                resource_tracker.ensure_running()
+            # Con fork, un proceso creado mientras otro hilo tiene tomado un
+            # lock lo hereda tomado y se cuelga; forkserver arranca los
+            # procesos desde un servidor sin hilos
+            context = multiprocessing.get_context('forkserver' if os.name == 'posix' else 'spawn')
+            executor = _executors[workers] = ProcessPoolExecutor(max_workers=workers,
+                                                                 mp_context=context)
+        return executor
+
+def _sort_bucket(keys_name, order_name, n, dtype, start, end):
+    """Ordena (de forma estable) el tramo [start, end) de las claves agrupadas"""
+    shm_keys = shared_memory.SharedMemory(name=keys_name)
+    shm_order = shared_memory.SharedMemory(name=order_name)
+    try:
+        keys = np.ndarray((n,), dtype=dtype, buffer=shm_keys.buf)
+        order = np.ndarray((n,), dtype=np.int64, buffer=shm_order.buf)
+        order[start:end] = np.argsort(keys[start:end], kind='stable') + start
+        del keys, order
+    finally:
+        shm_keys.close()
+        shm_order.close()
+    return end - start
+
+def choose_splitters(keys, buckets, oversample=OVERSAMPLE, seed=0):
+    """Toma una muestra aleatoria y devuelve buckets-1 separadores equiespaciados"""
+    rng = np.random.default_rng(seed)
+    sample = np.sort(rng.choice(keys, size=min(len(keys), buckets * oversample), replace=False))
+    return sample[(np.arange(1, buckets) * len(sample)) // buckets]
+
+def sample_order(keys, workers=None, min_parallel_rows=MIN_PARALLEL_ROWS):
+    """Devuelve la permutación estable que ordena `keys` usando todos los núcleos"""
+    keys = np.ascontiguousarray(keys)
+    n = len(keys)
+    workers = min(workers or os.cpu_count(), np.iinfo(np.int16).max)
+    # Los procesos de un pool (p. ej. ProcessSortBackend) no pueden crear otro pool
+    if workers <= 1 or n < min_parallel_rows or multiprocessing.current_process().daemon:
+        return np.argsort(keys, kind='stable')
+
+    splitters = choose_splitters(keys, workers)
+    bucket = np.searchsorted(splitters, keys, side='right').astype(np.int16)
+    # Agrupar por bucket conservando el orden original dentro de cada uno
+    # (argsort estable sobre int16 es un radix sort, O(n))
+    grouped = np.argsort(bucket, kind='stable')
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(bucket, minlength=workers))))
+
+    shm_keys = shared_memory.SharedMemory(create=True, size=max(keys.nbytes, 1))
+    shm_order = shared_memory.SharedMemory(create=True, size=max(n * 8, 1))
+    try:
+        shared_keys = np.ndarray((n,), dtype=keys.dtype, buffer=shm_keys.buf)
+        np.take(keys, grouped, out=shared_keys)
+        executor = _get_executor(workers)
+        futures = [executor.submit(_sort_bucket, shm_keys.name, shm_order.name, n,
+                                   keys.dtype.str, bounds[i], bounds[i + 1])
+                   for i in range(workers) if bounds[i + 1] > bounds[i]]
+        for future in futures:
+            future.result()
+        local = np.ndarray((n,), dtype=np.int64, buffer=shm_order.buf)
+        result = grouped[local]
+        del shared_keys, local
+    finally:
+        shm_keys.close()
+        shm_keys.unlink()
+        shm_order.close()
+        shm_order.unlink()
+    return result
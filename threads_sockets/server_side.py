@@ -1,63 +1,350 @@
 import socket
 import threading
-import json
-import pandas as pd
-from threading_ed2 import bubble_sort, quick_sort, merge_sort, heap_sort
+import queue
+import time
+from protocol import recv_message, send_packed, pack_message, decode_dataframe, encode_dataframe
+from threading_ed2 import ALGORITHMS
+from metrics import RequestSpans, phase, connection, start_metrics_server, watch_cache
+
+class LocalSortBackend:
+    """Ordena en el mismo proceso del servidor (comportamiento por defecto)"""
+    def sort(self, algorithm, body, column='FECHA_VENTA'):
+        with phase('decode'):
+            df = decode_dataframe(body)
+        with phase('sort'):
+            result, time_taken = ALGORITHMS[algorithm](df, column)
+        with phase('encode'):
+            return encode_dataframe(result), time_taken
+
+LOCAL_BACKEND = LocalSortBackend()
+
+# Límite de cada recv/send una vez empezado un mensaje (el keepalive solo
+# limita la espera entre mensajes)
+IO_TIMEOUT = 60.0
+
+def process_request(request, body, backend=None, spans=None):
+    """Ordena el cuerpo de una petición; devuelve (cabecera, cuerpo).
+
+    El `backend` recibe el cuerpo Arrow sin decodificar: LocalSortBackend por
+    defecto, ProcessSortBackend para usar varios procesos o ResultCache
+    envolviendo a cualquiera de los dos. Las fases que mida el backend se
+    registran en `spans` (RequestSpans).
+
+    Una respuesta servida por la caché lleva 'cached': True y su 'time' es el
+    del ordenamiento que la generó, no un ordenamiento de esta petición.
+    """
+    algorithm = request['algorithm']
+    if algorithm not in ALGORITHMS:
+        raise ValueError("Algoritmo no soportado")
+    column = request.get('column', 'FECHA_VENTA')
+
+    if spans is not None:
+        with spans.active():
+            result_body, time_taken, cached = run_sort(backend, algorithm, body, column)
+    else:
+        result_body, time_taken, cached = run_sort(backend, algorithm, body, column)
+
+    response = {
+        'status': 'ok',
+        'algorithm': algorithm,
+        'time': time_taken
+    }
+    if cached:
+        response['cached'] = True
+    return response, result_body
+
+def run_sort(backend, algorithm, body, column):
+    """(cuerpo, tiempo, cached); solo ResultCache puede responder desde la caché"""
+    backend = backend or LOCAL_BACKEND
+    if hasattr(backend, 'sort_cached'):
+        return backend.sort_cached(algorithm, body, column)
+    return backend.sort(algorithm, body, column) + (False,)
+
+def error_response(error):
+    return {'status': 'error', 'error': str(error)}, b''
+
+def reply_to(request, response):
+    """Copia el request_id de la petición para que el cliente empareje respuestas"""
+    if 'request_id' in request:
+        response['request_id'] = request['request_id']
+    return response
+
+def algorithm_label(request):
+    """Etiqueta de algoritmo para las métricas (acotada a los conocidos)"""
+    algorithm = request.get('algorithm')
+    return algorithm if algorithm in ALGORITHMS else 'desconocido'
+
+def handle_client(client_socket, client_address, backend=None, keepalive_timeout=60.0,
+                  accepted_at=None, io_timeout=IO_TIMEOUT):
+    """Atiende todas las peticiones de una conexión y la cierra al terminar.
+
+    La conexión se mantiene abierta hasta que el cliente la cierra o pasan
+    `keepalive_timeout` segundos sin que empiece una nueva petición; dentro de
+    un mensaje cada recv/send espera hasta `io_timeout` segundos. Las
+    peticiones que llegan encadenadas (pipelining) se responden en el mismo
+    orden. `accepted_at` (perf_counter del accept) se usa para la fase
+    accept_wait.
+    """
+    accept_wait = time.perf_counter() - accepted_at if accepted_at is not None else None
+    try:
+        with connection():
+            while True:
+                spans = RequestSpans(accept_wait)
+                accept_wait = None
+                try:
+                    request, body = recv_message(client_socket, spans.begin,
+                                                 keepalive_timeout, io_timeout)
+                except socket.timeout:
+                    break
+                if request is None:
+                    break
+                spans.received()
+
+                status = 'ok'
+                try:
+                    try:
+                        response, result = process_request(request, body, backend, spans)
+                    except Exception as e:
+                        print(f"Error con cliente {client_address}: {str(e)}")
+                        response, result = error_response(e)
+                        status = 'error'
+
+                    with spans.phase('send'):
+                        send_packed(client_socket, *pack_message(reply_to(request, response), result))
+                finally:
+                    spans.finish(algorithm_label(request), status)
+
+    except Exception as e:
+        print(f"Error con cliente {client_address}: {str(e)}")
+    finally:
+        client_socket.close()
 
 class SortingServerThread(threading.Thread):
-    def __init__(self, client_socket, client_address):
+    def __init__(self, client_socket, client_address, backend=None, keepalive_timeout=60.0,
+                 accepted_at=None):
         threading.Thread.__init__(self)
         self.client_socket = client_socket
         self.client_address = client_address
-    
+        self.backend = backend
+        self.keepalive_timeout = keepalive_timeout
+        self.accepted_at = accepted_at
+
     def run(self):
-        try:
-            data = self.client_socket.recv(16384)
-            if not data:
-                return
-                
-            request = json.loads(data.decode())
-            df = pd.DataFrame(request['data'])
-            algorithm = request['algorithm']
-            
-            if algorithm == 'bubble':
-                result, time_taken = bubble_sort(df)
-            elif algorithm == 'quick':
-                result, time_taken = quick_sort(df)
-            elif algorithm == 'merge':
-                result, time_taken = merge_sort(df)
-            elif algorithm == 'heap':
-                result, time_taken = heap_sort(df)
-            else:
-                raise ValueError("Algoritmo no soportado")
-            
-            response = {
-                'algorithm': algorithm,
-                'time': time_taken,
-                'sorted_data': result.to_dict('records')
-            }
-            
-            self.client_socket.sendall(json.dumps(response).encode())
-            
-        except Exception as e:
-            print(f"Error con cliente {self.client_address}: {str(e)}")
-        finally:
-            self.client_socket.close()
+        handle_client(self.client_socket, self.client_address, self.backend,
+                      self.keepalive_timeout, self.accepted_at)
 
-def start_server(host='localhost', port=8080):
+def start_server(host='localhost', port=8080, backlog=5, backend=None, keepalive_timeout=60.0):
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_socket.bind((host, port))
-    server_socket.listen(5)
+    server_socket.listen(backlog)
     print(f"Servidor escuchando en {host}:{port}")
-    
+
     try:
         while True:
             client_socket, client_address = server_socket.accept()
+            accepted_at = time.perf_counter()
             print(f"Conexión aceptada de {client_address}")
-            thread = SortingServerThread(client_socket, client_address)
+            thread = SortingServerThread(client_socket, client_address, backend,
+                                         keepalive_timeout, accepted_at)
             thread.start()
     finally:
         server_socket.close()
 
+class QueueStats:
+    """Métricas de la cola de peticiones para dimensionar el pool"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.processed = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_enqueue(self, depth):
+        with self.lock:
+            self.accepted += 1
+            self.max_depth = max(self.max_depth, depth)
+
+    def record_reject(self):
+        with self.lock:
+            self.rejected += 1
+
+    def record_wait(self, wait):
+        with self.lock:
+            self.processed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self, depth):
+        with self.lock:
+            return {
+                'queue_depth': depth,
+                'max_queue_depth': self.max_depth,
+                'accepted': self.accepted,
+                'rejected': self.rejected,
+                'processed': self.processed,
+                'avg_wait': self.total_wait / self.processed if self.processed else 0.0,
+                'max_wait': self.max_wait
+            }
+
+class SortingWorker(threading.Thread):
+    def __init__(self, name, requests, stats, backend=None, keepalive_timeout=5.0):
+        threading.Thread.__init__(self, name=name, daemon=True)
+        self.requests = requests
+        self.stats = stats
+        self.backend = backend
+        self.keepalive_timeout = keepalive_timeout
+
+    def run(self):
+        while True:
+            item = self.requests.get()
+            if item is None:
+                break
+            client_socket, client_address, enqueued_at = item
+            self.stats.record_wait(time.perf_counter() - enqueued_at)
+            handle_client(client_socket, client_address, self.backend, self.keepalive_timeout,
+                          enqueued_at)
+
+class SortingServerPool:
+    """Servidor con un número fijo de hilos y una cola acotada de conexiones.
+
+    Cuando la cola está llena se espera hasta `busy_timeout` segundos por un
+    lugar libre; si no aparece, se responde con estado 'busy' y se cierra.
+    Cada hilo atiende una conexión mientras esta tenga peticiones; el
+    `keepalive_timeout` es corto para que un cliente inactivo no retenga un hilo.
+    """
+    def __init__(self, host='localhost', port=8080, pool_size=4, queue_size=16,
+                 backlog=128, busy_timeout=0.0, stats_interval=0, backend=None,
+                 keepalive_timeout=5.0):
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.busy_timeout = busy_timeout
+        self.stats_interval = stats_interval
+        self.backend = backend
+        self.requests = queue.Queue(maxsize=queue_size)
+        self.queue_stats = QueueStats()
+        self.workers = [SortingWorker(f"worker-{i}", self.requests, self.queue_stats, backend,
+                                      keepalive_timeout)
+                        for i in range(pool_size)]
+        self.server_socket = None
+
+    def stats(self):
+        stats = self.queue_stats.snapshot(self.requests.qsize())
+        if hasattr(self.backend, 'stats'):
+            stats['cache'] = self.backend.stats()
+        return stats
+
+    def enqueue(self, client_socket, client_address):
+        try:
+            if self.busy_timeout > 0:
+                self.requests.put((client_socket, client_address, time.perf_counter()),
+                                  timeout=self.busy_timeout)
+            else:
+                self.requests.put_nowait((client_socket, client_address, time.perf_counter()))
+            self.queue_stats.record_enqueue(self.requests.qsize())
+        except queue.Full:
+            self.queue_stats.record_reject()
+            self.reject(client_socket, client_address)
+
+    def reject(self, client_socket, client_address):
+        print(f"Servidor ocupado, rechazando {client_address}")
+        try:
+            response = {
+                'status': 'busy',
+                'error': 'Servidor ocupado, intente más tarde',
+                'queue_depth': self.requests.qsize()
+            }
+            send_packed(client_socket, *pack_message(response))
+            client_socket.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+        finally:
+            client_socket.close()
+
+    def serve_forever(self):
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_socket.bind((self.host, self.port))
+        self.server_socket.listen(self.backlog)
+        for worker in self.workers:
+            worker.start()
+        if self.stats_interval > 0:
+            threading.Thread(target=self.report_stats, args=(self.stats_interval,), daemon=True).start()
+        print(f"Servidor (pool de {len(self.workers)} hilos) escuchando en {self.host}:{self.port}")
+
+        try:
+            while True:
+                client_socket, client_address = self.server_socket.accept()
+                self.enqueue(client_socket, client_address)
+        except OSError:
+            # El socket se cerró desde shutdown()
+            pass
+        finally:
+            self.server_socket.close()
+
+    def report_stats(self, interval):
+        while True:
+            time.sleep(interval)
+            print(f"Estado de la cola: {self.stats()}")
+
+    def shutdown(self):
+        if self.server_socket:
+            try:
+                self.server_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.server_socket.close()
+        for _ in self.workers:
+            self.requests.put(None)
+
+def start_pool_server(host='localhost', port=8080, pool_size=4, queue_size=16,
+                      backlog=128, busy_timeout=0.0, stats_interval=0, backend=None,
+                      keepalive_timeout=5.0):
+    server = SortingServerPool(host, port, pool_size, queue_size, backlog,
+                               busy_timeout, stats_interval, backend, keepalive_timeout)
+    server.serve_forever()
+
 if __name__ == "__main__":
-    start_server()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Servidor de ordenamiento")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--modo', choices=['hilos', 'pool'], default='hilos',
+                        help="hilos: un hilo por conexión; pool: hilos fijos con cola acotada")
+    parser.add_argument('--backlog', type=int, default=None)
+    parser.add_argument('--pool', type=int, default=4, help="Número de hilos del pool")
+    parser.add_argument('--cola', type=int, default=16, help="Tamaño máximo de la cola")
+    parser.add_argument('--espera', type=float, default=0.0,
+                        help="Segundos a esperar por la cola llena antes de responder 'busy'")
+    parser.add_argument('--stats', type=float, default=0,
+                        help="Intervalo en segundos para imprimir el estado de la cola")
+    parser.add_argument('--procesos', type=int, default=0,
+                        help="Ordenar en un pool de N procesos (0: en el proceso del servidor)")
+    parser.add_argument('--cache-mb', type=int, default=0,
+                        help="Memoria para la caché de resultados en MB (0: sin caché)")
+    parser.add_argument('--keepalive', type=float, default=None,
+                        help="Segundos de inactividad antes de cerrar una conexión")
+    parser.add_argument('--metricas', type=int, default=0, metavar='PUERTO',
+                        help="Publica métricas Prometheus en http://host:PUERTO/metrics (0: no)")
+    args = parser.parse_args()
+
+    if args.metricas:
+        start_metrics_server(args.metricas, args.host)
+
+    backend = None
+    if args.procesos > 0:
+        from process_backend import ProcessSortBackend
+        backend = ProcessSortBackend(args.procesos)
+    if args.cache_mb > 0:
+        from result_cache import ResultCache
+        backend = ResultCache(backend or LOCAL_BACKEND, args.cache_mb * 1024 ** 2)
+        watch_cache(backend)
+
+    if args.modo == 'pool':
+        start_pool_server(args.host, args.port, args.pool, args.cola,
+                          args.backlog or 128, args.espera, args.stats, backend,
+                          args.keepalive or 5.0)
+    else:
+        start_server(args.host, args.port, args.backlog or 5, backend, args.keepalive or 60.0)
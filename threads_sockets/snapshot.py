@@ -0,0 +1,175 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from index_sorts import comparable_keys, sort_by, merge_order
+
+# Snapshot ordenado de VENTAS en disco. Los datos se guardan en partes Arrow
+# IPC contiguas y ordenadas; manifest.json lista las partes con su rango
+# (valores mínimo y máximo de la columna) y guarda la marca de agua (mayor
+# ID_VENTA ya incorporado).
+#
+# La marca de agua se compara como texto en la consulta (ID_VENTA > marca),
+# lo que solo respeta el orden de inserción con IDs de ancho fijo rellenados
+# con ceros (p. ej. V00000042); refresh() rechaza IDs de otro ancho.
+#
+# Cada actualización ordena solo las filas nuevas y reescribe únicamente las
+# partes cuyo rango se solapa con ellas (en una tabla que crece por fecha,
+# normalmente solo la última parte).
+
+MANIFEST_VERSION = 2
+
+def json_value(value):
+    """Valor de la columna como lo guarda el manifest (fechas en ISO, que se
+    comparan bien como texto); None para nulos"""
+    if pd.isna(value):
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value.item() if hasattr(value, 'item') else value
+
+def is_after(part_max, value):
+    """part_max > value, con los nulos (que van al final) como máximo"""
+    if part_max is None:
+        return value is not None
+    return value is not None and part_max > value
+
+class SortedSnapshot:
+    def __init__(self, directory, column='FECHA_VENTA', watermark_column='ID_VENTA',
+                 part_rows=500000):
+        self.directory = directory
+        self.column = column
+        self.watermark_column = watermark_column
+        self.part_rows = part_rows
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = self._read_manifest()
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, 'manifest.json')
+
+    @property
+    def watermark(self):
+        return self.manifest['watermark']
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {
+                'version': MANIFEST_VERSION,
+                'column': self.column,
+                'watermark_column': self.watermark_column,
+                'watermark': None,
+                'rows': 0,
+                'next_part': 0,
+                'parts': []
+            }
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        if manifest['version'] != MANIFEST_VERSION or manifest['column'] != self.column:
+            raise ValueError(f"Snapshot incompatible en {self.directory}")
+        return manifest
+
+    def _write_manifest(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _read_part(self, part):
+        with pa.memory_map(os.path.join(self.directory, part['file'])) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def _write_part(self, df):
+        name = f"part_{self.manifest['next_part']:06d}.arrow"
+        self.manifest['next_part'] += 1
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(os.path.join(self.directory, name), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        values = df[self.column]
+        return {'file': name, 'rows': len(df), 'min': json_value(values.iloc[0]),
+                'max': json_value(values.iloc[-1])}
+
+    def load(self):
+        """Devuelve el snapshot completo, ya ordenado, como DataFrame"""
+        if not self.manifest['parts']:
+            return pd.DataFrame()
+        tables = [self._read_part(part) for part in self.manifest['parts']]
+        return pa.concat_tables(tables).to_pandas()
+
+    def refresh(self, chunks):
+        """Incorpora las filas nuevas (posteriores a la marca de agua).
+
+        `chunks` es un iterable de DataFrames/RecordBatch con solo las filas
+        nuevas, p. ej. stream_ventas(..., after_id=snapshot.watermark).
+        """
+        frames = [c.to_pandas() if isinstance(c, (pa.RecordBatch, pa.Table)) else c
+                  for c in chunks]
+        frames = [f for f in frames if len(f)]
+        if not frames:
+            return {'new_rows': 0, 'rewritten_rows': 0, 'rows': self.manifest['rows']}
+
+        delta = pd.concat(frames, ignore_index=True)
+        self._check_watermark_ids(delta[self.watermark_column])
+        delta = sort_by(delta, merge_order, self.column).reset_index(drop=True)
+        delta_keys = comparable_keys(delta, self.column)
+        delta_min = json_value(delta[self.column].iloc[0])
+
+        # Partes afectadas: las que tienen claves mayores que la menor nueva y,
+        # para no acumular partes pequeñas, la última si no está llena
+        parts = self.manifest['parts']
+        first = len(parts)
+        while first > 0 and is_after(parts[first - 1]['max'], delta_min):
+            first -= 1
+        if first == len(parts) and parts and parts[-1]['rows'] < self.part_rows:
+            first -= 1
+        affected = parts[first:]
+
+        if affected:
+            old = pa.concat_tables([self._read_part(p) for p in affected]).to_pandas()
+            old_keys = comparable_keys(old, self.column)
+            merged, _ = merge_sorted(old, old_keys, delta, delta_keys)
+        else:
+            merged = delta
+
+        new_parts = [self._write_part(merged.iloc[i:i + self.part_rows])
+                     for i in range(0, len(merged), self.part_rows)]
+
+        self.manifest['parts'] = parts[:first] + new_parts
+        self.manifest['rows'] += len(delta)
+        watermark = delta[self.watermark_column].max()
+        if self.watermark is None or watermark > self.watermark:
+            self.manifest['watermark'] = watermark.item() if hasattr(watermark, 'item') else watermark
+        self._write_manifest()
+
+        # Borrar las partes reemplazadas solo después de publicar el manifest
+        for part in affected:
+            os.remove(os.path.join(self.directory, part['file']))
+
+        return {'new_rows': len(delta), 'rewritten_rows': len(merged) - len(delta),
+                'rows': self.manifest['rows']}
+
+    def _check_watermark_ids(self, ids):
+        """Los IDs de texto deben tener todos el ancho de la marca de agua"""
+        if ids.dtype != object:
+            return
+        widths = set(ids.dropna().str.len().unique())
+        if self.watermark is not None and isinstance(self.watermark, str):
+            widths.add(len(self.watermark))
+        if len(widths) > 1:
+            raise ValueError(f"{self.watermark_column} debe tener ancho fijo (rellenado con "
+                             f"ceros) para usarse como marca de agua; anchos: {sorted(widths)}")
+
+def merge_sorted(left, left_keys, right, right_keys):
+    """Mezcla lineal de dos DataFrames ya ordenados; en empates van primero los de `left`"""
+    pos_left = np.arange(len(left)) + np.searchsorted(right_keys, left_keys, side='left')
+    pos_right = np.arange(len(right)) + np.searchsorted(left_keys, right_keys, side='right')
+    combined = pd.concat([left, right], ignore_index=True)
+    take = np.empty(len(combined), dtype=np.int64)
+    take[pos_left] = np.arange(len(left))
+    take[pos_right] = len(left) + np.arange(len(right))
+    keys = np.empty(len(combined), dtype=np.result_type(left_keys, right_keys))
+    keys[pos_left] = left_keys
+    keys[pos_right] = right_keys
+    return combined.take(take).reset_index(drop=True), keys
@@ -1,33 +1,149 @@
 import socket
-import pickle
+import queue
+import threading
+import itertools
 import pandas as pd
+from protocol import recv_dataframe, send_message
 from sorting_algorithms import bubble_sort, quick_sort, merge_sort, heap_sort
 
 class SocketManager:
-    def __init__(self, host='localhost', port=8080):
+    """Cliente del servidor de ordenamiento con conexiones persistentes.
+
+    Mantiene hasta `pool_size` conexiones abiertas para reutilizarlas entre
+    llamadas. `send_batch` envía varias peticiones seguidas por la misma
+    conexión (pipelining) y empareja las respuestas por request_id.
+    """
+    def __init__(self, host='localhost', port=8080, pool_size=4, timeout=10):
         self.host = host
         self.port = port
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.request_ids = itertools.count(1)
         self.algorithms = {
             'bubble': bubble_sort,
             'quick': quick_sort,
             'merge': merge_sort,
             'heap': heap_sort
         }
-    
-    def send_data(self, df):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def connect(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)  # 10 segundos de timeout por defecto
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.connect((self.host, self.port))
+        return sock
+
+    def acquire(self):
+        """Devuelve (socket, reutilizado) tomando una conexión libre si la hay"""
+        try:
+            return self.idle.get_nowait(), True
+        except queue.Empty:
+            return self.connect(), False
+
+    def release(self, sock):
+        if self.idle.qsize() < self.pool_size:
+            self.idle.put(sock)
+        else:
+            sock.close()
+
+    def close(self):
+        """Cierra todas las conexiones libres del pool"""
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def send_data(self, df, algorithm='quick', column='FECHA_VENTA'):
         """Envía datos al servidor y recibe resultados"""
+        return self.send_batch([df], algorithm, column)[0]
+
+    def send_batch(self, dfs, algorithm='quick', column='FECHA_VENTA'):
+        """Envía varios DataFrames por una sola conexión sin esperar cada respuesta.
+
+        Devuelve una lista con un resultado por DataFrame, en el mismo orden,
+        o None en las posiciones que fallaron.
+        """
+        requests = [({'algorithm': algorithm, 'column': column,
+                      'request_id': next(self.request_ids)}, df)
+                    for df in dfs]
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(10)  # 10 segundos de timeout
-                sock.connect((self.host, self.port))
-                
-                # Enviar datos
-                sock.sendall(pickle.dumps(df))
-                
-                # Recibir resultados
-                results = pickle.loads(sock.recv(65536))
-                return results
-                
+            sock, reused = self.acquire()
+            try:
+                responses = self.pipeline(sock, requests)
+            except (OSError, ConnectionError):
+                sock.close()
+                if not reused:
+                    raise
+                # La conexión del pool pudo haber expirado en el servidor
+                sock = self.connect()
+                responses = self.pipeline(sock, requests)
         except Exception as e:
             print(f"Error de conexión: {str(e)}")
-            return None
\ No newline at end of file
+            return [None] * len(requests)
+
+        if responses is None:
+            sock.close()
+            return [None] * len(requests)
+        self.release(sock)
+
+        results = []
+        for request, _ in requests:
+            response, sorted_df = responses.get(request['request_id'], (None, None))
+            if response is None:
+                results.append(None)
+            elif response.get('status') != 'ok':
+                print(f"Error del servidor: {response.get('error')}")
+                results.append(None)
+            else:
+                results.append({
+                    'algorithm': response['algorithm'],
+                    'time': response['time'],
+                    'cached': response.get('cached', False),
+                    'sorted_data': sorted_df
+                })
+        return results
+
+    def pipeline(self, sock, requests):
+        """Envía todas las peticiones desde otro hilo mientras lee las respuestas,
+        para que ninguno de los dos extremos se bloquee con los buffers llenos.
+
+        Devuelve {request_id: (cabecera, DataFrame)} o None si el servidor
+        respondió 'busy' y cerró la conexión.
+        """
+        send_error = []
+
+        def sender():
+            try:
+                for header, df in requests:
+                    send_message(sock, header, df)
+            except OSError as e:
+                # Si el servidor está ocupado puede responder y cerrar antes
+                # de leer todo el cuerpo
+                send_error.append(e)
+
+        thread = threading.Thread(target=sender, daemon=True)
+        thread.start()
+
+        responses = {}
+        try:
+            while len(responses) < len(requests):
+                response, sorted_df = recv_dataframe(sock)
+                if response is None:
+                    if send_error:
+                        raise send_error[0]
+                    raise ConnectionError("El servidor cerró la conexión sin responder")
+                if response.get('status') == 'busy':
+                    print(f"Servidor ocupado (cola: {response.get('queue_depth')})")
+                    return None
+                responses[response.get('request_id')] = (response, sorted_df)
+        finally:
+            thread.join()
+        return responses
@@ -1,19 +1,7 @@
 import threading
-import time
 import pandas as pd
 import numpy as np
-from functools import wraps
-
-# Decorador para medir tiempo
-def timeit(func):
-    @wraps(func)
-    def timeit_wrapper(*args, **kwargs):
-        start_time = time.perf_counter()
-        result = func(*args, **kwargs)
-        end_time = time.perf_counter()
-        total_time = end_time - start_time
-        return (result, total_time)
-    return timeit_wrapper
+from timing import timeit
 
 # Algoritmos de ordenamiento
 @timeit
@@ -1,72 +1,47 @@
 import time
 import pandas as pd
+import pyarrow as pa
 import os
 import json
 import shutil
-from functools import wraps
-from mysql.connector import connect, errorcode, Error
-from dotenv import load_dotenv
-
-# Configuración inicial
-load_dotenv()
-config = {
-    "user": os.environ['DATABASE_USERNAME'],
-    "password": os.environ['DATABASE_PASSWORD'],
-    "host": os.environ['DATABASE_HOST'],
-    "database": os.environ['DATABASE_NAME'],
-    "charset": 'utf8'
-}
-
-# Decorador para medir tiempo
-def timeit(func):
-    @wraps(func)
-    def timeit_wrapper(*args, **kwargs):
-        start_time = time.perf_counter()
-        result = func(*args, **kwargs)
-        end_time = time.perf_counter()
-        total_time = end_time - start_time
-        return (result, total_time)
-    return timeit_wrapper
-
-# Algoritmos de ordenamiento
-@timeit
-def bubble_sort(df, column='FECHA_VENTA'):
-    df = df.copy()
-    n = len(df)
-    for i in range(n):
-        swapped = False
-        for j in range(0, n-i-1):
-            if df.iloc[j][column] > df.iloc[j+1][column]:
-                df.iloc[j], df.iloc[j+1] = df.iloc[j+1], df.iloc[j].copy()
-                swapped = True
-        if not swapped:
-            break
-    return df
-
-@timeit
-def quick_sort(df, column='FECHA_VENTA'):
-    return df.sort_values(column, kind='quicksort')
-
-@timeit
-def merge_sort(df, column='FECHA_VENTA'):
-    return df.sort_values(column, kind='mergesort')
-
-@timeit
-def heap_sort(df, column='FECHA_VENTA'):
-    return df.sort_values(column, kind='heapsort')
-
-def export_data(all_sorted_dfs, format_type, sort_method, export_dir, iteration_times):
-    format_type = format_type.upper()
-    base_name = f"ventas_{sort_method}"
-    extension = format_type.lower() if format_type != 'TXT' else 'txt'
-    file_name = f"{base_name}.{extension}"
-    file_path = os.path.join(export_dir, file_name)
-    
-    # Crear directorio de resultados detallados
+from db_backend import get_backend
+from external_sort import external_sort
+from snapshot import SortedSnapshot
+from dataset_cache import DatasetCache
+from threading_ed2 import ALGORITHMS
+from instrumentation import MemoryStats, track_memory
+from data_generator import generate_ventas, DISTRIBUTIONS
+from results_store import ResultsStore, new_run_id
+from exporters import open_writer, export_filename, benchmark_matrix, CODECS
+
+VENTAS_COLUMNS = ['ID_VENTA', 'FECHA_VENTA', 'ID_CLIENTE', 'ID_EMPLEADO',
+                  'ID_PRODUCTO', 'CANTIDAD', 'PRECIO_UNITARIO', 'DESCUENTO', 'FORMA_PAGO']
+
+# Memoria aproximada de una fila de VENTAS en un DataFrame (medida con
+# memory_usage(deep=True) sobre datos generados)
+VENTAS_ROW_BYTES = 256
+
+# Tipos Arrow de cada columna de VENTAS (los mismos del schema Avro)
+VENTAS_SCHEMA = pa.schema([
+    ('ID_VENTA', pa.string()),
+    ('FECHA_VENTA', pa.date32()),
+    ('ID_CLIENTE', pa.int32()),
+    ('ID_EMPLEADO', pa.int32()),
+    ('ID_PRODUCTO', pa.int32()),
+    ('CANTIDAD', pa.int32()),
+    ('PRECIO_UNITARIO', pa.float64()),
+    ('DESCUENTO', pa.float64()),
+    ('FORMA_PAGO', pa.string())
+])
+
+def export_path(export_dir, sort_method, format_type, codec='none'):
+    return os.path.join(export_dir, export_filename(format_type, f"ventas_{sort_method}", codec))
+
+def save_iteration_times(export_dir, sort_method, iteration_times):
+    """Guarda los tiempos de cada iteración en detailed_results/times_<método>.json"""
     detailed_dir = os.path.join(export_dir, 'detailed_results')
     os.makedirs(detailed_dir, exist_ok=True)
     
-    # Guardar tiempos de iteración
     times_file = os.path.join(detailed_dir, f"times_{sort_method}.json")
     with open(times_file, 'w') as f:
         json.dump({
@@ -76,30 +51,10 @@ def export_data(all_sorted_dfs, format_type, sort_method, export_dir, iteration_
             'min_time': min(iteration_times),
             'max_time': max(iteration_times)
         }, f, indent=2)
-    
-    start_time = time.time()
-    
-    try:
-        if format_type == 'CSV':
-            pd.concat(all_sorted_dfs).to_csv(file_path, index=False)
-        elif format_type == 'JSON':
-            # Para JSON, guardamos solo el último dataframe ordenado para evitar archivos muy grandes
-            all_sorted_dfs[-1].to_json(file_path, orient='records', indent=2)
-        elif format_type == 'PARQUET':
-            pd.concat(all_sorted_dfs).to_parquet(file_path, engine='pyarrow')
-        elif format_type == 'TXT':
-            pd.concat(all_sorted_dfs).to_csv(file_path, index=False, sep='\t')
-        else:
-            raise ValueError(f"Formato no soportado: {format_type}")
-        
-        file_size = os.path.getsize(file_path)
-        return file_path, file_size, time.time() - start_time
-    
-    except Exception as e:
-        print(f"Error exportando {format_type}: {str(e)}")
-        return None, None, None
 
-def main():
+def main(backend, start_date=None, end_date=None, limit=100, chunk_size=50000,
+         formats=None, export_options=None, cache=None, iterations=50, warmup=1, data=None,
+         store=None, distribution=None, memory=False):
     # Configuración inicial
     export_dir = 'exports'
     os.makedirs(export_dir, exist_ok=True)
@@ -115,59 +70,61 @@ def main():
         except Exception as e:
             print(f"Error al eliminar {file_path}: {e}")
     
-    # Conexión a la base de datos
-    cnx = get_connection()
-    if not cnx:
-        print("Error de conexión a la base de datos")
+    # Datos generados (`data`) o lectura desde la base de datos / caché local
+    df = data if data is not None else load_ventas(backend, start_date, end_date, limit,
+                                                   chunk_size, cache)
+    if df is None:
         return
     
-    try:
-        print("Connection established")
-        # Cambié la consulta para obtener más datos significativos
-        data = get_data(cnx, "SELECT * FROM VENTAS LIMIT 100")  # Asegúrate que el nombre de la tabla es correcto
-    except Error as e:
-        print(f"Error al obtener datos: {e}")
-        return
-    finally:
-        cnx.close()
-    
-    if not data:
-        print("No se obtuvieron datos de la base de datos")
-        return
-    
-    # Verificar que la columna FECHA_VENTA existe
-    df = pd.DataFrame(data, columns=['ID_VENTA', 'FECHA_VENTA', 'ID_CLIENTE', 'ID_EMPLEADO',
-                   'ID_PRODUCTO', 'CANTIDAD', 'PRECIO_UNITARIO', 'DESCUENTO', 'FORMA_PAGO'])
-    
     # Verificar que la columna de ordenación existe
     if 'FECHA_VENTA' not in df.columns:
         print("Error: La columna FECHA_VENTA no existe en el DataFrame")
         print("Columnas disponibles:", df.columns.tolist())
         return
     
-    sort_methods = {
-        'bubble': bubble_sort,
-        'quick': quick_sort,
-        'merge': merge_sort,
-        'heap': heap_sort
-    }
-    
-    formats = ['CSV', 'JSON', 'PARQUET', 'TXT']
+    formats = formats or ['CSV', 'JSON', 'PARQUET', 'TXT']
+    export_options = export_options or {}
+    codec = export_options.get('codec', 'none')
     results = []
+    run_id = new_run_id()
     
-    for method_name, method_func in sort_methods.items():
+    for method_name, method_func in ALGORITHMS.items():
         print(f"\nProbando {method_name} sort...")
         sort_times = []
-        all_sorted = []
+        sort_memories = []
+        sort_memory = MemoryStats()
+        
+        # Cada iteración se escribe en todos los formatos y se libera enseguida,
+        # así el pico de memoria queda cerca de una sola copia del dataset
+        writers = {}
+        for fmt in formats:
+            try:
+                writers[fmt] = open_writer(fmt, export_path(export_dir, method_name, fmt, codec),
+                                           **export_options)
+            except Exception as e:
+                print(f"Error exportando {fmt}: {str(e)}")
+        export_memory = {fmt: MemoryStats() for fmt in writers}
         
-        for i in range(1, 51):
-            sorted_df, sort_time = method_func(df)
+        # Ejecuciones de calentamiento: ni se miden ni se exportan
+        for _ in range(warmup):
+            method_func(df)
+        
+        for i in range(1, iterations + 1):
+            with track_memory(enabled=memory) as iteration_memory:
+                sorted_df, sort_time = method_func(df)
             sort_times.append(sort_time)
-            all_sorted.append(sorted_df)
+            sort_memories.append(iteration_memory)
+            sort_memory.merge(iteration_memory)
+            for fmt, writer in writers.items():
+                with track_memory(export_memory[fmt], memory):
+                    writer.write(sorted_df)
+            del sorted_df
             
             if i % 10 == 0:
                 print(f"Iteración {i}: {sort_time:.5f}s")
         
+        save_iteration_times(export_dir, method_name, sort_times)
+        
         stats = {
             'method': method_name,
             'avg_sort': sum(sort_times)/len(sort_times),
@@ -175,19 +132,40 @@ def main():
             'max_sort': max(sort_times)
         }
         
+        if memory:
+            stats.update(sort_memory.as_dict('sort_'))
+        
+        samples = [{'run_id': run_id, 'method': method_name, 'size': len(df), 'stage': 'sort',
+                    'distribution': distribution, 'iteration': i, 'seconds': t,
+                    **mem.as_dict()}
+                   for i, (t, mem) in enumerate(zip(sort_times, sort_memories), 1)]
+        
         for fmt in formats:
-            path, size, export_time = export_data(all_sorted, fmt, method_name, export_dir, sort_times)
+            path = None
+            if fmt in writers:
+                with track_memory(export_memory[fmt], memory):
+                    path, size, export_time = writers[fmt].close()
             if path:
+                samples.append({'run_id': run_id, 'method': method_name, 'format': fmt,
+                                'size': len(df), 'stage': 'export', 'codec': codec,
+                                'distribution': distribution, 'iteration': 0,
+                                'seconds': export_time, 'bytes': size,
+                                **export_memory[fmt].as_dict()})
                 results.append({
                     **stats,
                     'format': fmt,
+                    'codec': codec,
                     'export_time': export_time,
                     'file_size': size,
-                    'file_path': path
+                    'file_path': path,
+                    **(export_memory[fmt].as_dict('export_') if memory else {})
                 })
                 print(f"Archivo generado: {path}")
             else:
                 print(f"Error al generar archivo para {method_name} en formato {fmt}")
+        
+        if store is not None:
+            store.append(samples)
     
     # Guardar resultados
     if results:
@@ -205,26 +183,257 @@ def main():
             'export_time': 'mean',
             'file_size': 'mean'
         }).to_string())
-    
+        if memory:
+            print("\nPico de memoria (MB):")
+            print((results_df.groupby(['method', 'format'])[
+                ['sort_rss_peak', 'sort_py_peak', 'export_rss_peak', 'export_py_peak']
+            ].max() / 2**20).round(2).to_string())
+            print("rss incluye los procesos hijos; py_peak solo mide el proceso "
+                  "principal (en sample no cuenta lo que reservan los workers)")
+
     print(f"\nArchivos guardados en: {os.path.abspath(export_dir)}")
+    if store is not None:
+        print(f"Muestras de la corrida {run_id} agregadas a: {os.path.abspath(store.root)}")
 
-def get_connection():
+def open_backend(name='mysql', **kwargs):
+    """Crea el backend de base de datos; devuelve None si no se pudo conectar"""
     try:
-        return connect(**config)
-    except Error as err:
+        backend = get_backend(name, **kwargs)
+        print(f"Backend {name} listo")
+        return backend
+    except Exception as err:
         print(f"Error de conexión: {err}")
         return None
 
-def get_data(connection, query):
-    cursor = connection.cursor()
+def build_ventas_query(start_date=None, end_date=None, limit=None, placeholder='%s',
+                       after_id=None):
+    """Arma la consulta de VENTAS con límites opcionales; devuelve (consulta, parámetros)"""
+    query = f"SELECT {', '.join(VENTAS_COLUMNS)} FROM VENTAS"
+    conditions, params = [], []
+    if after_id is not None:
+        conditions.append(f"ID_VENTA > {placeholder}")
+        params.append(after_id)
+    if start_date is not None:
+        conditions.append(f"FECHA_VENTA >= {placeholder}")
+        params.append(start_date)
+    if end_date is not None:
+        conditions.append(f"FECHA_VENTA <= {placeholder}")
+        params.append(end_date)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    return query, tuple(params)
+
+def rows_to_batch(rows):
+    """Convierte filas (tuplas) a un RecordBatch columnar con los tipos de VENTAS"""
+    arrays = []
+    for values, field in zip(zip(*rows), VENTAS_SCHEMA):
+        try:
+            arrays.append(pa.array(values, type=field.type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # p. ej. DECIMAL -> double o IDs numéricos -> string
+            arrays.append(pa.array(values).cast(field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=VENTAS_SCHEMA)
+
+def stream_ventas(backend, start_date=None, end_date=None, limit=None, chunk_size=50000,
+                  as_arrow=False, after_id=None):
+    """Lee VENTAS por bloques de `chunk_size` filas con un cursor sin buffer.
+
+    Produce RecordBatch de Arrow (as_arrow=True) o DataFrames, de modo que la
+    memoria usada depende del tamaño del bloque y no del de la tabla.
+    """
+    query, params = build_ventas_query(start_date, end_date, limit, backend.placeholder,
+                                       after_id)
+    with backend.connection() as cnx:
+        cursor = backend.stream_cursor(cnx)
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                batch = rows_to_batch(rows)
+                yield batch if as_arrow else batch.to_pandas()
+        finally:
+            try:
+                cursor.close()
+            except backend.Error:
+                # Con un cursor sin buffer quedan filas sin leer si se corta antes
+                pass
+
+def load_ventas(backend, start_date=None, end_date=None, limit=None, chunk_size=50000,
+                cache=None):
+    """Lee VENTAS completa como DataFrame; devuelve None si falla o no hay filas.
+
+    Con `cache` (DatasetCache) la primera lectura guarda la consulta en un
+    archivo Arrow y las siguientes la abren mapeada en memoria sin ir a la base.
+    """
+    key = None
+    if cache is not None:
+        query, params = build_ventas_query(start_date, end_date, limit, backend.placeholder)
+        key = DatasetCache.make_key(backend.source, query, params, VENTAS_SCHEMA)
+        start_time = time.perf_counter()
+        table = cache.get(key)
+        if table is not None:
+            print(f"{table.num_rows} filas leídas de la caché local "
+                  f"({time.perf_counter() - start_time:.3f}s)")
+            return table.to_pandas(split_blocks=True) if table.num_rows else None
+    
     try:
-        cursor.execute(query)
-        return cursor.fetchall()
-    except Error as e:
-        print(f"Error al ejecutar consulta: {e}")
+        batches = stream_ventas(backend, start_date, end_date, limit, chunk_size, as_arrow=True)
+        if key is not None:
+            batches = cache.store(key, batches, VENTAS_SCHEMA, description=query)
+        table = pa.Table.from_batches(list(batches), schema=VENTAS_SCHEMA)
+    except backend.Error as e:
+        print(f"Error al obtener datos: {e}")
         return None
-    finally:
-        cursor.close()
+    
+    if not table.num_rows:
+        print("No se obtuvieron datos de la base de datos")
+        return None
+    return table.to_pandas()
+
+def main_matrix(backend, output_dir, formats=None, codecs=None, export_options=None,
+                start_date=None, end_date=None, limit=100, chunk_size=50000, cache=None):
+    """Benchmark de formato × codec sobre los datos leídos: tiempo de escritura,
+    de lectura y bytes de cada combinación"""
+    df = load_ventas(backend, start_date, end_date, limit, chunk_size, cache)
+    if df is None:
+        return
+    results_df = benchmark_matrix(df, output_dir, formats, codecs, **(export_options or {}))
+    results_path = os.path.join(output_dir, 'matriz_exportacion.csv')
+    results_df.to_csv(results_path, index=False)
+    
+    columns = [c for c in ['format', 'codec', 'write_time', 'read_time', 'bytes', 'error']
+               if c in results_df.columns]
+    print(results_df[columns].to_string(index=False))
+    print(f"\nResultados guardados en: {results_path}")
+
+def main_external(backend, output_path, memory_mb=512, temp_dir=None, chunk_size=50000,
+                  start_date=None, end_date=None, limit=None):
+    """Ordena VENTAS por FECHA_VENTA sin cargarla entera en memoria"""
+    # Cada bloque leído tiene que entrar en el presupuesto de una corrida
+    max_rows = max(memory_mb * 1024 ** 2 // 2 // VENTAS_ROW_BYTES, 1)
+    if chunk_size > max_rows:
+        print(f"Bloques de {max_rows} filas para respetar el presupuesto de {memory_mb} MB")
+        chunk_size = max_rows
+    try:
+        start_time = time.perf_counter()
+        chunks = stream_ventas(backend, start_date, end_date, limit, chunk_size, as_arrow=True)
+        result = external_sort(chunks, output_path, memory_budget=memory_mb * 1024 ** 2,
+                               temp_dir=temp_dir)
+        print(f"{result['rows']} filas ordenadas en {result['runs']} corridas "
+              f"({time.perf_counter() - start_time:.2f}s): {result['output_path']}")
+    except backend.Error as e:
+        print(f"Error al obtener datos: {e}")
+
+def refresh_snapshot(backend, directory, chunk_size=50000):
+    """Actualiza el snapshot ordenado de VENTAS con las filas nuevas"""
+    try:
+        snapshot = SortedSnapshot(directory)
+        start_time = time.perf_counter()
+        chunks = stream_ventas(backend, chunk_size=chunk_size, as_arrow=True,
+                               after_id=snapshot.watermark)
+        result = snapshot.refresh(chunks)
+        print(f"Snapshot actualizado en {time.perf_counter() - start_time:.2f}s: "
+              f"{result['new_rows']} filas nuevas, {result['rewritten_rows']} reescritas, "
+              f"{result['rows']} en total (marca de agua: {snapshot.watermark})")
+    except backend.Error as e:
+        print(f"Error al obtener datos: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark de ordenamiento sobre VENTAS")
+    parser.add_argument('--externo', metavar='SALIDA',
+                        help="Ordenamiento externo de toda la tabla hacia SALIDA (.parquet o .arrow)")
+    parser.add_argument('--memoria', type=int, default=512, help="Presupuesto de memoria en MB")
+    parser.add_argument('--snapshot', metavar='DIR',
+                        help="Actualiza el snapshot ordenado incremental guardado en DIR")
+    parser.add_argument('--tmp', default=None, help="Directorio para las corridas temporales")
+    parser.add_argument('--chunk', type=int, default=50000, help="Filas por bloque leído")
+    parser.add_argument('--desde', default=None, help="FECHA_VENTA mínima (YYYY-MM-DD)")
+    parser.add_argument('--hasta', default=None, help="FECHA_VENTA máxima (YYYY-MM-DD)")
+    parser.add_argument('--limite', type=int, default=None,
+                        help="Máximo de filas a leer (por defecto 100 en el benchmark, sin límite en --externo)")
+    parser.add_argument('--backend', choices=['mysql', 'sqlite'], default='mysql',
+                        help="mysql: base remota; sqlite: base local en memoria con datos de ejemplo")
+    parser.add_argument('--sqlite', metavar='ARCHIVO', default=None,
+                        help="Base sqlite en ARCHIVO en lugar de en memoria (implica --backend "
+                             "sqlite); los datos de ejemplo solo se cargan si está vacía")
+    parser.add_argument('--filas-sqlite', type=int, default=10000,
+                        help="Filas de ejemplo a cargar en el backend sqlite")
+    parser.add_argument('--pool', type=int, default=5, help="Tamaño del pool de conexiones")
+    parser.add_argument('--formatos', nargs='+', type=str.upper, default=None,
+                        help="Formatos a exportar (CSV JSON PARQUET TXT FEATHER ORC AVRO)")
+    parser.add_argument('--codec', default='none', choices=CODECS, help="Codec de compresión")
+    parser.add_argument('--nivel', type=int, default=None, help="Nivel de compresión")
+    parser.add_argument('--row-group', type=int, default=None,
+                        help="Filas por row group (por defecto uno por iteración)")
+    parser.add_argument('--sin-diccionario', action='store_true',
+                        help="Desactiva la codificación por diccionario")
+    parser.add_argument('--matriz', metavar='DIR',
+                        help="Benchmark de formato × codec (escritura, lectura y bytes) en DIR")
+    parser.add_argument('--codecs', nargs='+', choices=CODECS, default=None,
+                        help="Codecs a recorrer con --matriz (por defecto todos)")
+    parser.add_argument('--iteraciones', type=int, default=50, help="Iteraciones medidas por algoritmo")
+    parser.add_argument('--calentamiento', type=int, default=1, help="Ejecuciones previas sin medir")
+    parser.add_argument('--generar', choices=DISTRIBUTIONS, default=None,
+                        help="Usa --limite filas generadas con esta distribución en lugar de la base")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla de los datos generados")
+    parser.add_argument('--almacen', metavar='DIR', default='results_store',
+                        help="Almacén Parquet particionado donde se agregan las muestras de cada corrida")
+    parser.add_argument('--sin-almacen', action='store_true', help="No guarda las muestras en el almacén")
+    parser.add_argument('--memoria-pico', action='store_true',
+                        help="Mide el pico de RSS y de tracemalloc de cada ordenamiento y "
+                             "exportación (los tiempos medidos así son más lentos)")
+    parser.add_argument('--cache-datos', metavar='DIR', default=None,
+                        help="Guarda los datos leídos en DIR (Arrow) y los reutiliza en las siguientes corridas")
+    parser.add_argument('--ttl', type=float, default=None,
+                        help="Segundos de validez de la caché de datos (por defecto no vence)")
+    parser.add_argument('--refrescar', action='store_true',
+                        help="Vacía la caché de datos antes de leer")
+    args = parser.parse_args()
+
+    export_options = {'level': args.nivel, 'row_group_size': args.row_group,
+                      'dictionary': not args.sin_diccionario}
+    limit = args.limite if args.limite is not None else 100
+    store = None if args.sin_almacen else ResultsStore(args.almacen)
+
+    # Benchmark con datos generados: no hace falta la base
+    if args.generar and not (args.snapshot or args.externo or args.matriz):
+        main(None, formats=args.formatos, export_options={**export_options, 'codec': args.codec},
+             iterations=args.iteraciones, warmup=args.calentamiento,
+             data=generate_ventas(limit, args.generar, args.semilla),
+             store=store, distribution=args.generar, memory=args.memoria_pico)
+        raise SystemExit(0)
+
+    if args.backend == 'sqlite' or args.sqlite:
+        backend = open_backend('sqlite', path=args.sqlite, rows=args.filas_sqlite,
+                               pool_size=args.pool, seed=args.semilla)
+    else:
+        backend = open_backend('mysql', pool_size=args.pool)
+    if backend is None:
+        raise SystemExit(1)
+
+    cache = None
+    if args.cache_datos:
+        cache = DatasetCache(args.cache_datos, args.ttl)
+        if args.refrescar:
+            print(f"{cache.invalidate()} entradas borradas de la caché de datos")
+    
+    try:
+        if args.snapshot:
+            refresh_snapshot(backend, args.snapshot, args.chunk)
+        elif args.externo:
+            main_external(backend, args.externo, args.memoria, args.tmp, args.chunk,
+                          args.desde, args.hasta, args.limite)
+        elif args.matriz:
+            main_matrix(backend, args.matriz, args.formatos, args.codecs, export_options,
+                        args.desde, args.hasta, limit, args.chunk, cache)
+        else:
+            main(backend, args.desde, args.hasta, limit, args.chunk,
+                 args.formatos, {**export_options, 'codec': args.codec}, cache,
+                 args.iteraciones, args.calentamiento, store=store, memory=args.memoria_pico)
+    finally:
+        backend.close()
@@ -1,59 +1,41 @@
-import pandas as pd
-import time
-from functools import wraps
 import threading
-# Decorador para medir tiempo
-def timeit(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        end = time.time()
-        return result, end - start
-    return wrapper
+from index_sorts import sort_by, bubble_order, quick_order, merge_order, heap_order
+from sample_sort import sample_order
+from timing import timeit
 
 @timeit
 def bubble_sort(df, column='FECHA_VENTA'):
     """Implementación de Bubble Sort optimizado"""
-    n = len(df)
-    sorted_df = df.copy()
-    for i in range(n):
-        swapped = False
-        for j in range(0, n-i-1):
-            if sorted_df.iloc[j][column] > sorted_df.iloc[j+1][column]:
-                sorted_df.iloc[j], sorted_df.iloc[j+1] = sorted_df.iloc[j+1], sorted_df.iloc[j]
-                swapped = True
-        if not swapped:
-            break
-    return sorted_df
+    return sort_by(df, bubble_order, column)
 
 @timeit
 def quick_sort(df, column='FECHA_VENTA'):
     """Implementación de Quick Sort"""
-    if len(df) <= 1:
-        return df
-    pivot = df.iloc[len(df)//2][column]
-    left = df[df[column] < pivot]
-    middle = df[df[column] == pivot]
-    right = df[df[column] > pivot]
-    return pd.concat([quick_sort(left)[0], middle, quick_sort(right)[0]])
+    return sort_by(df, quick_order, column)
 
 @timeit
 def merge_sort(df, column='FECHA_VENTA'):
     """Implementación de Merge Sort"""
-    if len(df) <= 1:
-        return df
-    mid = len(df) // 2
-    left = merge_sort(df.iloc[:mid])[0]
-    right = merge_sort(df.iloc[mid:])[0]
-    return pd.merge(left, right, how='outer')
+    return sort_by(df, merge_order, column)
 
 @timeit
 def heap_sort(df, column='FECHA_VENTA'):
     """Implementación de Heap Sort"""
-    sorted_df = df.copy()
-    sorted_df.sort_values(column, inplace=True)
-    return sorted_df
+    return sort_by(df, heap_order, column)
+
+@timeit
+def sample_sort(df, column='FECHA_VENTA'):
+    """Sample Sort paralelo en varios procesos"""
+    return sort_by(df, sample_order, column)
+
+# Algoritmos disponibles por nombre (usado por los servidores)
+ALGORITHMS = {
+    'bubble': bubble_sort,
+    'quick': quick_sort,
+    'merge': merge_sort,
+    'heap': heap_sort,
+    'sample': sample_sort
+}
 
 class SortingThread(threading.Thread):
     def __init__(self, name, algorithm, data):
@@ -0,0 +1,37 @@
+import gc
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Medición de tiempos común a todos los módulos con el reloj perf_counter_ns.
+# timeit y measure_ns no tocan el GC: se usan también en el servidor y en el
+# pipeline, y el GC es global al proceso. Los benchmarks que quieren medir sin
+# pausas del GC envuelven la medición en gc_disabled().
+
+@contextmanager
+def gc_disabled():
+    """Desactiva el GC durante el bloque y lo deja como estaba. Afecta a todo
+    el proceso: usar solo en benchmarks que miden desde un único hilo."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def measure_ns(func, *args, **kwargs):
+    """Ejecuta func una vez y devuelve (resultado, nanosegundos)"""
+    start = time.perf_counter_ns()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter_ns() - start
+    return result, elapsed
+
+# Decorador para medir tiempo: devuelve (resultado, segundos)
+def timeit(func):
+    @wraps(func)
+    def timeit_wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        result = func(*args, **kwargs)
+        return result, (time.perf_counter_ns() - start) / 1e9
+    return timeit_wrapper